@@ -0,0 +1 @@
+# 성능 측정용 가상 데이터 생성기와 벤치마크 실행기 (python -m benchmarks.run)
@@ -0,0 +1,145 @@
+import argparse
+import csv
+import math
+import os
+
+import numpy as np
+
+# 행정안전부 연령별 인구현황 CSV와 같은 형식 (cp949, 천 단위 쉼표, '100세 이상' 포함 101개 연령)
+AGE_LABELS = [f"{age}세" for age in range(100)] + ['100세 이상']
+ENCODING = 'cp949'
+LAST_MONTH = (2025, 4)
+# 시도 하나에 속한 시군구 수 / 시군구 하나에 속한 읍면동 수 (행정코드 자릿수 안에서 만들 수 있는 범위)
+SIGUNGU_PER_SIDO = 50
+DONG_PER_SIGUNGU = 27
+MAX_SIDO = 89
+
+
+# LAST_MONTH에서 거슬러 올라간 months개월의 '2025년04월' 형식 목록 (오래된 순)
+def month_names(months, last=LAST_MONTH):
+    year, month = last
+    names = []
+    for _ in range(months):
+        names.append(f"{year}년{month:02d}월")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return names[::-1]
+
+
+def _month_stamp(name):
+    return name[:4] + name[5:7]
+
+
+def _header(months, sexes):
+    header = ['행정구역']
+    for month in months:
+        for sex in sexes:
+            header += [f"{month}_{sex}_총인구수", f"{month}_{sex}_연령구간인구수"]
+            header += [f"{month}_{sex}_{label}" for label in AGE_LABELS]
+    return header
+
+
+# 시도 하나 분량의 행 (행정구역 표시 이름, 부모 행 번호): 시도 → 시군구 → 읍면동 순
+def _sido_rows(sido, n_sigungu, n_dong):
+    sido_code = (11 + sido) * 10 ** 8
+    sido_name = f"가상시도{sido + 1:02d}"
+    rows = [(f"{sido_name}  ({sido_code})", -1)]
+    for g in range(n_sigungu):
+        sigungu_code = sido_code + (g + 1) * 10 ** 6
+        sigungu_name = f"{sido_name} 가상구{g + 1:03d}"
+        parent = len(rows)
+        rows.append((f"{sigungu_name} ({sigungu_code})", 0))
+        for d in range(n_dong):
+            rows.append((f"{sigungu_name} 가상동{d + 1:03d} ({sigungu_code + (d + 1) * 10 ** 3})", parent))
+    return rows
+
+
+# n_districts개가 되도록 시도별 (시군구 수, 읍면동 수) 배분
+def _layout(n_districts):
+    per_sido = 1 + SIGUNGU_PER_SIDO * (1 + DONG_PER_SIGUNGU)
+    n_sido = min(MAX_SIDO, max(1, math.ceil(n_districts / per_sido)))
+    n_dong = DONG_PER_SIGUNGU
+    n_sigungu = SIGUNGU_PER_SIDO
+    if n_sido == 1:
+        n_sigungu = max(1, min(SIGUNGU_PER_SIDO, math.ceil((n_districts - 1) / (1 + n_dong))))
+    elif n_sido == MAX_SIDO and n_sido * per_sido < n_districts:
+        n_dong = min(99, math.ceil((n_districts / n_sido - 1) / SIGUNGU_PER_SIDO) - 1)
+    return n_sido, n_sigungu, n_dong
+
+
+# 말단(읍면동) 값만 난수로 만들고 상위 행은 하위 합계로 채움 → (행, 월, 남/여, 연령)
+def _sido_values(rng, rows, n_months):
+    parents = np.array([parent for _, parent in rows])
+    is_leaf = np.ones(len(rows), dtype=bool)
+    is_leaf[parents[parents >= 0]] = False
+
+    n_ages = len(AGE_LABELS)
+    # 연령별 기본 분포(고령으로 갈수록 감소) × 행정구역 규모 × 월별 소폭 변동
+    profile = np.concatenate([np.full(60, 1.0), np.linspace(1.0, 0.05, n_ages - 60)])
+    scale = rng.uniform(5, 60, size=(len(rows), 1, 2, 1))
+    drift = 1 + np.cumsum(rng.normal(0, 0.002, size=(1, n_months, 1, 1)), axis=1)
+    values = rng.poisson(scale * drift * profile).astype(np.int32)
+    values[~is_leaf] = 0
+
+    # 읍면동 → 시군구 → 시도 순으로 합산 (rows는 부모가 항상 자식보다 앞)
+    for i in range(len(rows) - 1, 0, -1):
+        values[parents[i]] += values[i]
+    return values
+
+
+def _format(values):
+    return [f"{v:,}" for v in values.tolist()]
+
+
+# 남녀 합계 / 남녀 구분 CSV 한 쌍을 행 단위로 바로 써서 생성 (시도 하나 분량만 메모리에 유지)
+# 반환값: (남녀 합계 경로, 남녀 구분 경로)
+def write_population_pair(directory, n_districts=3911, n_months=1, seed=0):
+    months = month_names(n_months)
+    stamp = f"{_month_stamp(months[0])}_{_month_stamp(months[-1])}"
+    os.makedirs(directory, exist_ok=True)
+    total_path = os.path.join(directory, f"{stamp}_연령별인구현황_월간_남녀합계.csv")
+    gender_path = os.path.join(directory, f"{stamp}_연령별인구현황_월간 _남녀구분.csv")
+
+    rng = np.random.default_rng(seed)
+    n_sido, n_sigungu, n_dong = _layout(n_districts)
+    written = 0
+    with open(total_path, 'w', encoding=ENCODING, newline='') as total_file, \
+            open(gender_path, 'w', encoding=ENCODING, newline='') as gender_file:
+        total_writer = csv.writer(total_file, lineterminator='\n')
+        gender_writer = csv.writer(gender_file, lineterminator='\n')
+        total_writer.writerow(_header(months, ['계']))
+        gender_writer.writerow(_header(months, ['남', '여']))
+
+        for sido in range(n_sido):
+            rows = _sido_rows(sido, n_sigungu, n_dong)[:n_districts - written]
+            values = _sido_values(rng, rows, n_months)
+            sums = values.sum(axis=-1)
+            for i, (label, _) in enumerate(rows):
+                total_row, gender_row = [label], [label]
+                for m in range(n_months):
+                    total = values[i, m, 0] + values[i, m, 1]
+                    total_sum = _format(sums[i, m, :1] + sums[i, m, 1:])
+                    total_row += total_sum + total_sum + _format(total)
+                    for s in range(2):
+                        sex_sum = _format(sums[i, m, s:s + 1])
+                        gender_row += sex_sum + sex_sum + _format(values[i, m, s])
+                total_writer.writerow(total_row)
+                gender_writer.writerow(gender_row)
+            written += len(rows)
+            if written >= n_districts:
+                break
+    return total_path, gender_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="연령별 인구현황 CSV 형식의 가상 데이터 생성")
+    parser.add_argument('directory')
+    parser.add_argument('--districts', type=int, default=3911)
+    parser.add_argument('--months', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    for path in write_population_pair(args.directory, args.districts, args.months, args.seed):
+        print(f"{path} ({os.path.getsize(path):,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
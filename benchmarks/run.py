@@ -0,0 +1,209 @@
+import argparse
+import gc
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.generate import write_population_pair
+from population.admin import build_admin_tree
+from population.binning import BIN_PRESETS, DEFAULT_PRESET, binning_for
+from population.loader import decode_source, parse_population_csv, read_population_table, read_source_bytes
+from population.schema import parse_columns
+from population.structure import band_totals, population_structure_table
+from population.tensor import load_tensor
+from population.timeseries import ingest_directory, open_store
+
+# 기준 결과 대비 이 배율보다 느려지거나 메모리를 더 쓰면 회귀로 판단
+REGRESSION_THRESHOLD = 1.25
+# 이보다 짧은 측정값은 오차가 커서 회귀 판단에서 제외
+MIN_COMPARABLE_SECONDS = 0.01
+
+
+# fn을 repeat번 실행한 시간(초)과 별도 1회 실행의 tracemalloc 최대 메모리(바이트)
+# setup은 매 실행 전에 호출되며 측정에 포함되지 않음 (예: 콜드 실행용 캐시 삭제)
+def measure(fn, repeat=5, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'peak_bytes': peak,
+    }
+
+
+# 페이지 재실행 한 번에 해당하는 계산 (load_data와 전국 인구 구조 표는 페이지처럼 미리 만들어 둔 것을 사용)
+def _page_rerun(population, row, ages, pyramid_binning, distribution_binning, structure_table):
+    tree = population.tree
+    band_totals(population.values[row, 0][None, :], ages)
+    distribution_binning.aggregate(population.values[row, 0])
+    pyramid_binning.aggregate(population.values[row, 1:])
+    population.frame(row)
+    # 전국 순위 / 하위 행정구역 표 (캐시된 표에서 정렬 / 행 선택만)
+    structure_table.sort_values('고령비율(%)', ascending=False).head(50)
+    structure_table.iloc[tree.children(row)]
+    for i in range(population.totals.shape[1]):
+        tree.consistency(population.totals[:, i])
+
+
+def run_benchmarks(data_dir, repeat=5, months_dir=None):
+    total_path, gender_path = _find_pair(data_dir)
+    work_dir = tempfile.mkdtemp(prefix='population-bench-')
+    snapshot_dir = os.path.join(work_dir, 'snapshot')
+    results = {}
+
+    def clear_snapshots():
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    try:
+        raw = read_source_bytes(total_path)
+        text = decode_source(raw)
+        results['decode'] = measure(lambda: decode_source(raw), repeat)
+        results['parse_csv'] = measure(lambda: parse_population_csv(text), repeat)
+        results['read_table_cold'] = measure(lambda: read_population_table(total_path, snapshot_dir), repeat, clear_snapshots)
+        read_population_table(total_path, snapshot_dir)
+        results['read_table_snapshot'] = measure(lambda: read_population_table(total_path, snapshot_dir), repeat)
+
+        header = parse_population_csv(text).columns
+        results['parse_columns'] = measure(lambda: parse_columns(header), repeat)
+
+        results['load_tensor_cold'] = measure(lambda: load_tensor(total_path, gender_path, snapshot_dir), repeat, clear_snapshots)
+        population = load_tensor(total_path, gender_path, snapshot_dir)
+        results['load_tensor_mmap'] = measure(lambda: load_tensor(total_path, gender_path, snapshot_dir), repeat)
+
+        ages = population.ages
+        values = np.asarray(population.values[:, 0])
+        names = np.asarray(population.districts)
+        results['admin_tree'] = measure(lambda: build_admin_tree(population.codes, names), repeat)
+        results['band_totals_all'] = measure(lambda: band_totals(values, ages), repeat)
+        results['structure_table_all'] = measure(lambda: population_structure_table(
+            values, ages, male_total=population.totals[:, 1], female_total=population.totals[:, 2]), repeat)
+        for preset, edges in BIN_PRESETS.items():
+            binning = binning_for(ages, edges)
+            results[f"binning_all[{preset}]"] = measure(lambda: binning.aggregate(values), repeat)
+
+        row = int(population.tree.children()[0])
+        pyramid_binning = binning_for(ages, BIN_PRESETS['5세 단위'])
+        distribution_binning = binning_for(ages, BIN_PRESETS[DEFAULT_PRESET])
+        structure_table = population_structure_table(
+            values, ages, index=population.districts, male_total=population.totals[:, 1], female_total=population.totals[:, 2])
+        results['page_rerun'] = measure(
+            lambda: _page_rerun(population, row, ages, pyramid_binning, distribution_binning, structure_table), repeat)
+
+        if months_dir:
+            store_dir = os.path.join(work_dir, 'timeseries')
+            results['timeseries_ingest'] = measure(
+                lambda: ingest_directory(months_dir, store_dir), 1, lambda: shutil.rmtree(store_dir, ignore_errors=True))
+            ingest_directory(months_dir, store_dir)
+            store = open_store(store_dir)
+            codes = np.asarray(population.codes[:10])
+            results['timeseries_trend'] = measure(lambda: store.trend(codes), repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'districts': len(population.codes),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'results': results,
+    }
+
+
+def _find_pair(data_dir):
+    names = sorted(os.listdir(data_dir))
+    total = [name for name in names if name.endswith('_남녀합계.csv')]
+    gender = [name for name in names if name.endswith('_남녀구분.csv')]
+    if not total or not gender:
+        raise FileNotFoundError(f"남녀 합계 / 남녀 구분 CSV가 없습니다: {data_dir}")
+    return os.path.join(data_dir, total[-1]), os.path.join(data_dir, gender[-1])
+
+
+# 기준 결과와 비교해 회귀 항목 목록 반환: (이름, 지표, 기준값, 현재값)
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        if base['min_s'] >= MIN_COMPARABLE_SECONDS and result['min_s'] > base['min_s'] * threshold:
+            regressions.append((name, 'min_s', base['min_s'], result['min_s']))
+        if base['peak_bytes'] > 0 and result['peak_bytes'] > base['peak_bytes'] * threshold:
+            regressions.append((name, 'peak_bytes', base['peak_bytes'], result['peak_bytes']))
+    return regressions
+
+
+def format_results(report):
+    lines = [f"행정구역 {report['districts']:,}개 (Python {report['python']}, NumPy {report['numpy']})",
+             f"{'항목':<32}{'최소(ms)':>12}{'중앙값(ms)':>12}{'최대 메모리(MB)':>16}"]
+    for name, result in report['results'].items():
+        lines.append(f"{name:<32}{result['min_s'] * 1000:>12.2f}{result['median_s'] * 1000:>12.2f}"
+                     f"{result['peak_bytes'] / 2 ** 20:>16.2f}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="인구 데이터 처리 함수 벤치마크")
+    parser.add_argument('--data-dir', help="측정할 CSV 한 쌍이 있는 디렉터리 (없으면 가상 데이터 생성)")
+    parser.add_argument('--districts', type=int, default=3911)
+    parser.add_argument('--months', type=int, default=1, help="1보다 크면 월별 시계열 수집도 측정")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과를 저장할 JSON 경로")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON (회귀가 있으면 종료 코드 1)")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    generated_dir = None
+    data_dir = args.data_dir
+    if data_dir is None:
+        generated_dir = tempfile.mkdtemp(prefix='population-data-')
+        data_dir = generated_dir
+        start = time.perf_counter()
+        write_population_pair(data_dir, args.districts, args.months, args.seed)
+        print(f"가상 데이터 생성: {time.perf_counter() - start:.1f}초")
+    try:
+        report = run_benchmarks(data_dir, args.repeat, data_dir if args.months > 1 else None)
+    finally:
+        if generated_dir:
+            shutil.rmtree(generated_dir, ignore_errors=True)
+
+    report['args'] = {'districts': args.districts, 'months': args.months, 'repeat': args.repeat, 'seed': args.seed}
+    print(format_results(report))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for name, metric, base, current in regressions:
+            print(f"회귀: {name} {metric} {base:.4g} → {current:.4g}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
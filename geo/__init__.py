@@ -0,0 +1 @@
+# GeoJSON 로컬 캐시 / 단순화 / 지도 인덱스 모듈
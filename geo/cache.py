@@ -0,0 +1,63 @@
+import json
+import os
+
+import requests
+
+from geo.simplify import simplify_features
+
+GEO_CACHE_DIR = os.path.join(".cache", "geo")
+# 해상도 단계: (단순화 허용 오차(도), 좌표 소수 자릿수) — 단계 번호가 클수록 정밀
+RESOLUTION_LEVELS = ((0.05, 3), (0.01, 4), (0.002, 5))
+# 이 줌 이상이면 다음 해상도 단계 사용
+ZOOM_THRESHOLDS = (5, 7)
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+# 원본 GeoJSON을 한 번만 내려받아 로컬에 보관 (로컬 경로면 그대로 읽음)
+def fetch_geojson(source, name, cache_dir=GEO_CACHE_DIR):
+    if os.path.exists(source):
+        with open(source, encoding='utf-8') as f:
+            return json.load(f)
+
+    path = os.path.join(cache_dir, name, 'source.json')
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    response = requests.get(source, timeout=60)
+    response.raise_for_status()
+    data = response.json()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write_json(path, data)
+    return data
+
+
+# 해상도 단계별로 단순화한 GeoJSON 목록 (처음 한 번 만들어 디스크에 저장)
+def load_geojson_levels(source, name, levels=RESOLUTION_LEVELS, cache_dir=GEO_CACHE_DIR):
+    directory = os.path.join(cache_dir, name)
+    result = []
+    raw = None
+    for i, (tolerance, decimals) in enumerate(levels):
+        path = os.path.join(directory, f"level_{i}_{tolerance}_{decimals}.json")
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                result.append(json.load(f))
+            continue
+        if raw is None:
+            raw = fetch_geojson(source, name, cache_dir)
+        simplified = dict(raw, features=simplify_features(raw['features'], tolerance, decimals))
+        os.makedirs(directory, exist_ok=True)
+        _write_json(path, simplified)
+        result.append(simplified)
+    return result
+
+
+# 지도 줌에 맞는 해상도 단계 번호
+def level_for_zoom(zoom, thresholds=ZOOM_THRESHOLDS):
+    return sum(zoom >= threshold for threshold in thresholds)
@@ -0,0 +1,78 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from geo.simplify import polygons_of
+
+# 타일 한 장의 픽셀 크기 (줌 계산용)
+TILE_SIZE = 256
+MAX_ZOOM = 10
+
+
+# 피처별 경계 상자 / 중심점 / FeatureCollection 내 위치 (선택 변경 시 전체 도형을 다시 훑지 않도록 한 번만 계산)
+@dataclass(frozen=True)
+class FeatureIndex:
+    offsets: dict          # 이름 -> features 배열 위치
+    bounds: np.ndarray     # (피처, 4): 최소 경도, 최소 위도, 최대 경도, 최대 위도
+    centroids: np.ndarray  # (피처, 2): 위도, 경도 (면적 가중)
+
+    # 경계 상자를 width x height 픽셀 지도에 맞추는 (중심, 줌)
+    def view(self, name, width=800, height=600):
+        i = self.offsets[name]
+        min_lon, min_lat, max_lon, max_lat = self.bounds[i]
+        return tuple(float(v) for v in self.centroids[i]), zoom_for_bounds(min_lon, min_lat, max_lon, max_lat, width, height)
+
+
+def _mercator_y(lat):
+    lat = max(min(lat, 85.0), -85.0)
+    return math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+
+
+# 경계 상자 전체가 보이는 가장 큰 정수 줌
+def zoom_for_bounds(min_lon, min_lat, max_lon, max_lat, width, height, max_zoom=MAX_ZOOM):
+    lon_fraction = max(max_lon - min_lon, 1e-9) / 360
+    lat_fraction = max(_mercator_y(max_lat) - _mercator_y(min_lat), 1e-9) / (2 * math.pi)
+    zoom = min(math.log2(width / TILE_SIZE / lon_fraction), math.log2(height / TILE_SIZE / lat_fraction))
+    return int(max(0, min(max_zoom, math.floor(zoom))))
+
+
+# 외곽 링들의 경계 상자와 면적 가중 중심 (날짜변경선을 넘는 피처는 동경 좌표를 -360 이동해 이어 붙임)
+def _bounds_and_centroid(geometry):
+    rings = [np.asarray(polygon[0], dtype=float) for polygon in polygons_of(geometry) if len(polygon[0]) >= 3]
+    if not rings:
+        return np.full(4, np.nan), np.full(2, np.nan)
+    points = np.concatenate(rings)
+    if points[:, 0].max() - points[:, 0].min() > 180:
+        rings = [np.column_stack([np.where(r[:, 0] > 0, r[:, 0] - 360, r[:, 0]), r[:, 1]]) for r in rings]
+        points = np.concatenate(rings)
+    bounds = np.array([points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max()])
+
+    # 신발끈 공식: 링별 면적과 중심을 면적으로 가중 평균
+    area_sum, cx, cy = 0.0, 0.0, 0.0
+    for ring in rings:
+        x, y = ring[:, 0], ring[:, 1]
+        cross = x * np.roll(y, -1) - np.roll(x, -1) * y
+        area = cross.sum() / 2
+        if area == 0:
+            continue
+        area_sum += area
+        cx += ((x + np.roll(x, -1)) * cross).sum() / 6
+        cy += ((y + np.roll(y, -1)) * cross).sum() / 6
+    if area_sum == 0:
+        return bounds, np.array([(bounds[1] + bounds[3]) / 2, (bounds[0] + bounds[2]) / 2])
+    return bounds, np.array([cy / area_sum, cx / area_sum])
+
+
+def build_feature_index(geojson, name_property='NAME'):
+    features = geojson['features']
+    names = tuple(feature['properties'][name_property] for feature in features)
+    bounds = np.empty((len(features), 4))
+    centroids = np.empty((len(features), 2))
+    for i, feature in enumerate(features):
+        bounds[i], centroids[i] = _bounds_and_centroid(feature.get('geometry'))
+    return FeatureIndex(
+        offsets={name: i for i, name in enumerate(names)},
+        bounds=bounds,
+        centroids=centroids,
+    )
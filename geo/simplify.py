@@ -0,0 +1,128 @@
+import copy
+from collections import defaultdict
+
+import numpy as np
+
+# 꼭짓점 동일성 판단에 쓰는 좌표 자릿수
+KEY_PRECISION = 7
+
+
+def _key(point):
+    return (round(float(point[0]), KEY_PRECISION), round(float(point[1]), KEY_PRECISION))
+
+
+# Polygon / MultiPolygon의 폴리곤 목록 (각 폴리곤은 [외곽 링, 구멍 링, ...])
+def polygons_of(geometry):
+    if geometry is None:
+        return []
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+# 더글라스-포이커: 남길 꼭짓점 마스크 (양 끝점은 항상 유지)
+def douglas_peucker(points, tolerance):
+    points = np.asarray(points, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+        segment = points[start + 1:end]
+        a, b = points[start], points[end]
+        direction = b - a
+        length = np.hypot(*direction)
+        if length == 0:
+            distances = np.hypot(*(segment - a).T)
+        else:
+            distances = np.abs(direction[0] * (segment[:, 1] - a[1]) - direction[1] * (segment[:, 0] - a[0])) / length
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            k = start + 1 + i
+            keep[k] = True
+            stack.append((start, k))
+            stack.append((k, end))
+    return keep
+
+
+# 위상 보존 단순화: 여러 링이 공유하는 경계는 양쪽에서 똑같이 단순화되어 틈이나 겹침이 생기지 않음
+# - 링 시작점과 '이 꼭짓점을 가진 링 집합'이 바뀌는 지점(접점)을 모든 링에서 고정점으로 사용
+# - 고정점 사이의 호(arc)를 정규 방향으로 한 번만 단순화해 공유 링들이 같은 결과를 사용
+def simplify_features(features, tolerance, decimals=6):
+    rings = []  # (피처 번호, 폴리곤 번호, 링 번호, 좌표 배열: 닫는 점 제외)
+    for f, feature in enumerate(features):
+        for p, polygon in enumerate(polygons_of(feature.get('geometry'))):
+            for r, ring in enumerate(polygon):
+                coords = np.asarray(ring, dtype=float)[:, :2]
+                if len(coords) > 1 and np.array_equal(coords[0], coords[-1]):
+                    coords = coords[:-1]
+                if len(coords) >= 3:
+                    rings.append((f, p, r, coords))
+
+    ring_keys = [[_key(point) for point in coords] for _, _, _, coords in rings]
+    owners = defaultdict(set)
+    for ring_id, keys in enumerate(ring_keys):
+        for key in keys:
+            owners[key].add(ring_id)
+
+    pinned = set()
+    for keys in ring_keys:
+        pinned.add(keys[0])
+        n = len(keys)
+        for k in range(n):
+            owner = owners[keys[k]]
+            if len(owner) >= 3 or owner != owners[keys[k - 1]] or owner != owners[keys[(k + 1) % n]]:
+                pinned.add(keys[k])
+
+    arc_cache = {}
+
+    def simplify_arc(arc):
+        forward = np.round(arc, KEY_PRECISION)
+        backward = forward[::-1]
+        reverse = backward.tobytes() < forward.tobytes()
+        canonical = backward if reverse else forward
+        cache_key = canonical.tobytes()
+        if cache_key not in arc_cache:
+            arc_cache[cache_key] = canonical[douglas_peucker(canonical, tolerance)]
+        result = arc_cache[cache_key]
+        return result[::-1] if reverse else result
+
+    simplified = defaultdict(dict)  # (피처, 폴리곤) -> {링 번호: 좌표 목록}
+    for (f, p, r, coords), keys in zip(rings, ring_keys):
+        pins = [k for k, key in enumerate(keys) if key in pinned]
+        extended = np.vstack([coords, coords])
+        parts = []
+        for i, start in enumerate(pins):
+            end = pins[i + 1] if i + 1 < len(pins) else pins[0] + len(coords)
+            arc = simplify_arc(extended[start:end + 1])
+            parts.append(arc[:-1])
+        ring = np.vstack(parts)
+        if len(ring) >= 3:
+            ring = np.round(np.vstack([ring, ring[:1]]), decimals)
+            simplified[(f, p)][r] = ring.tolist()
+
+    result = []
+    for f, feature in enumerate(features):
+        feature = copy.copy(feature)
+        polygons = []
+        for p, polygon in enumerate(polygons_of(feature.get('geometry'))):
+            kept = simplified.get((f, p), {})
+            # 외곽 링이 너무 작아져 사라지면 폴리곤 전체를 제외 (구멍은 남은 것만 유지)
+            if 0 in kept:
+                polygons.append([kept[r] for r in sorted(kept)])
+        if not polygons and polygons_of(feature.get('geometry')):
+            # 모든 폴리곤이 사라진 피처는 가장 큰 폴리곤의 원래 외곽 링을 유지
+            largest = max(polygons_of(feature['geometry']), key=lambda polygon: len(polygon[0]))
+            polygons = [[np.round(np.asarray(largest[0], dtype=float)[:, :2], decimals).tolist()]]
+        if polygons:
+            geometry_type = 'Polygon' if len(polygons) == 1 else 'MultiPolygon'
+            feature['geometry'] = {
+                'type': geometry_type,
+                'coordinates': polygons[0] if geometry_type == 'Polygon' else polygons,
+            }
+        result.append(feature)
+    return result
@@ -1,7 +1,10 @@
+import json
+
 import streamlit as st
 import folium
-import requests
-from streamlit_folium import st_folium
+
+from geo.cache import level_for_zoom, load_geojson_levels
+from geo.index import build_feature_index
 
 # 최신 US states geojson 링크
 geojson_url = "https://eric.clst.org/assets/wiki/uploads/Stuff/gz_2010_us_040_00_500k.json"
@@ -21,34 +24,85 @@ state_list = [
 ]
 state = st.selectbox("주를 선택하세요:", state_list)
 
-# GeoJSON 데이터 요청
-response = requests.get(geojson_url)
-geojson_data = response.json()
-
-# Folium 지도 생성
-m = folium.Map(location=[37.8, -96], zoom_start=4)
-
-def style_function(feature):
-    # GeoJSON의 주 이름은 'NAME' 필드에 있음!
-    if state == '전체' or feature['properties']['NAME'] == state:
-        return {
-            'fillColor': 'orange',
-            'color': 'black',
-            'weight': 2,
-            'fillOpacity': 0.7
-        }
-    else:
-        return {
-            'fillColor': 'lightgray',
-            'color': 'gray',
-            'weight': 1,
-            'fillOpacity': 0.3
-        }
-
-folium.GeoJson(
-    geojson_data,
-    style_function=style_function,
-    tooltip=folium.GeoJsonTooltip(fields=['NAME'])
-).add_to(m)
-
-st_folium(m, width=800, height=600)
+# GeoJSON은 처음 한 번만 내려받아 로컬에 저장하고, 해상도 단계별로 단순화해 둠 (재실행 시 네트워크 요청 없음)
+@st.cache_resource
+def get_geojson_levels(url):
+    return load_geojson_levels(url, "us_states")
+
+# 주별 경계 상자 / 중심점 / 피처 위치 (GeoJSON의 주 이름은 'NAME' 필드에 있음!)
+@st.cache_resource
+def get_feature_index(url):
+    return build_feature_index(get_geojson_levels(url)[-1], 'NAME')
+
+feature_index = get_feature_index(geojson_url)
+
+# 선택한 주의 경계에 맞춘 보기 (전체면 미국 본토 중심)
+if state in feature_index.offsets:
+    map_center, map_zoom = feature_index.view(state, 800, 600)
+else:
+    map_center, map_zoom = (37.8, -96), 4
+map_level = level_for_zoom(map_zoom)
+
+selected_style = {
+    'fillColor': 'orange',
+    'color': 'black',
+    'weight': 2,
+    'fillOpacity': 0.7
+}
+base_style = {
+    'fillColor': 'lightgray',
+    'color': 'gray',
+    'weight': 1,
+    'fillOpacity': 0.3
+}
+
+# 브라우저에서 선택을 반영하는 스크립트: 주 이름 -> 레이어 표를 한 번 만들고, 선택이 오면 색과 보기만 바꿈
+# (iframe은 앱과 같은 출처라 부모 창에 접근 가능, 선택 스크립트가 부모 창에 남긴 마지막 선택을 지도가 늦게 뜨더라도 읽어 옴)
+_SELECT_SCRIPT = """
+(function () {
+    var map = %(map)s, layer = %(layer)s;
+    var baseStyle = %(base)s, selectedStyle = %(selected)s;
+    var byName = {};
+    layer.eachLayer(function (l) { byName[l.feature.properties.NAME] = l; });
+    function select(selection) {
+        if (!selection) return;
+        layer.setStyle(selection.state === '전체' ? selectedStyle : baseStyle);
+        var target = byName[selection.state];
+        if (target) { target.setStyle(selectedStyle); target.bringToFront(); }
+        map.setView(selection.center, selection.zoom);
+    }
+    window.usMapSelect = select;
+    try { select(window.parent.usMapSelection); } catch (e) {}
+})();
+"""
+
+# 해상도 단계별 기본 지도 HTML (처음 한 번만 만들어 모든 세션이 같은 문자열을 공유)
+# 선택과 무관하게 같은 내용이라 Streamlit이 이미 보낸 메시지는 해시 참조로만 다시 보냄
+# 스타일은 Leaflet 옵션의 고정 스타일로 넘겨 파이썬에서 피처를 훑지 않음
+@st.cache_resource
+def get_base_map_html(url, level):
+    m = folium.Map(location=[37.8, -96], zoom_start=4)
+    layer = folium.GeoJson(
+        get_geojson_levels(url)[level],
+        style=base_style,
+        tooltip=folium.GeoJsonTooltip(fields=['NAME'])
+    ).add_to(m)
+    m.get_root().script.add_child(folium.Element(_SELECT_SCRIPT % {
+        'map': m.get_name(), 'layer': layer.get_name(),
+        'base': json.dumps(base_style), 'selected': json.dumps(selected_style),
+    }))
+    return m.get_root().render()
+
+st.iframe(get_base_map_html(geojson_url, map_level), width=800, height=600)
+
+# 선택이 바뀔 때마다 보내는 것은 주 이름 / 중심 / 줌뿐인 작은 스크립트 (같은 탭의 지도 iframe에 전달)
+selection = json.dumps({'state': state, 'center': list(map_center), 'zoom': map_zoom}, ensure_ascii=False)
+st.iframe(f"""<script>
+var selection = {selection};
+try {{
+    window.parent.usMapSelection = selection;
+    window.parent.document.querySelectorAll('iframe').forEach(function (frame) {{
+        try {{ if (frame.contentWindow.usMapSelect) frame.contentWindow.usMapSelect(selection); }} catch (e) {{}}
+    }});
+}} catch (e) {{}}
+</script>""", height="content")
@@ -0,0 +1 @@
+# 주가 데이터 수집/캐시 모듈 (Streamlit 없이도 사용 가능)
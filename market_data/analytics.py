@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# 연환산에 쓰는 연간 거래일 수와 변동성 계산 창(거래일)
+TRADING_DAYS = 252
+VOLATILITY_WINDOW = 21
+# 차트 한 선에 보내는 최대 점 수 (LTTB 다운샘플링)
+MAX_CHART_POINTS = 1000
+
+
+# 날짜 × 티커 가격 패널에서 한 번에 계산한 지표 (모두 같은 인덱스 / 컬럼)
+@dataclass(frozen=True)
+class PanelAnalytics:
+    normalized: pd.DataFrame    # 첫 가격 대비 누적 수익률 (%)
+    volatility: pd.DataFrame    # 일간 로그 수익률의 이동 표준편차, 연환산 (%)
+    drawdown: pd.DataFrame      # 직전 최고가 대비 하락률 (%)
+    correlation: pd.DataFrame   # 일간 로그 수익률 상관계수 (두 티커가 모두 있는 날만 사용)
+
+
+def _rolling_std(returns, window):
+    valid = ~np.isnan(returns)
+    filled = np.where(valid, returns, 0.0)
+    zeros = np.zeros((1, returns.shape[1]))
+    sums = np.concatenate([zeros, np.cumsum(filled, axis=0)])
+    squares = np.concatenate([zeros, np.cumsum(filled ** 2, axis=0)])
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+
+    # 누적합의 차로 창 합계 계산 (창 길이만큼 값이 모두 있어야 표시)
+    end = np.arange(1, len(returns) + 1)
+    start = np.maximum(end - window, 0)
+    n = counts[end] - counts[start]
+    s1 = sums[end] - sums[start]
+    s2 = squares[end] - squares[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (s2 - s1 ** 2 / n) / (n - 1)
+    variance[n < window] = np.nan
+    return np.sqrt(np.clip(variance, 0, None))
+
+
+# 결측치가 있는 열끼리 쌍마다 공통 관측일만으로 상관계수 계산 (행렬곱 몇 번으로 모든 쌍을 한꺼번에)
+def _pairwise_correlation(returns):
+    valid = (~np.isnan(returns)).astype(float)
+    x = np.where(valid > 0, returns, 0.0)
+    n = valid.T @ valid
+    sx = x.T @ valid            # [i, j]: j도 값이 있는 날의 i 합계
+    sxx = (x ** 2).T @ valid
+    sxy = x.T @ x
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sx.T
+        corr = cov / np.sqrt((n * sxx - sx ** 2) * (n * sxx.T - sx.T ** 2))
+    corr[n < 3] = np.nan
+    return corr
+
+
+# df_all(날짜 × 티커, 거래일이 달라 생긴 결측 포함)에서 수익률 / 변동성 / 낙폭 / 상관계수를 NumPy로 계산
+def analyze_panel(df_all, window=VOLATILITY_WINDOW):
+    prices = df_all.ffill().to_numpy(dtype=float)
+    columns = np.arange(prices.shape[1])
+    observed = ~np.isnan(prices)
+
+    first_row = np.argmax(observed, axis=0)
+    normalized = (prices / prices[first_row, columns] - 1) * 100
+
+    log_prices = np.log(prices)
+    returns = np.full_like(prices, np.nan)
+    returns[1:] = np.diff(log_prices, axis=0)
+    # 원래 값이 없던 날(휴장 등 forward-fill한 날)의 0 수익률은 제외
+    raw_observed = df_all.notna().to_numpy()
+    returns[~raw_observed] = np.nan
+
+    volatility = _rolling_std(returns, window) * np.sqrt(TRADING_DAYS) * 100
+    running_max = np.fmax.accumulate(prices, axis=0)
+    drawdown = (prices / running_max - 1) * 100
+
+    def frame(values):
+        return pd.DataFrame(values, index=df_all.index, columns=df_all.columns)
+
+    return PanelAnalytics(
+        normalized=frame(normalized),
+        volatility=frame(volatility),
+        drawdown=frame(drawdown),
+        correlation=pd.DataFrame(_pairwise_correlation(returns), index=df_all.columns, columns=df_all.columns),
+    )
+
+
+# Largest-Triangle-Three-Buckets: 모양을 유지하며 threshold개 점의 위치(행 번호)를 고름
+# 첫/마지막 점은 항상 포함, 각 구간에서 이전 선택점 / 다음 구간 평균과 이루는 삼각형이 가장 큰 점을 선택
+def lttb(x, y, threshold=MAX_CHART_POINTS):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        bucket_x, bucket_y = x[start:end], y[start:end]
+        areas = np.abs((x[previous] - next_x) * (bucket_y - y[previous]) - (x[previous] - bucket_x) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+# 시계열 하나를 차트용으로 줄임 (결측 제외 후 LTTB) → (인덱스, 값)
+def downsample(series, threshold=MAX_CHART_POINTS):
+    series = series.dropna()
+    if len(series) <= threshold:
+        return series.index, series.to_numpy()
+    x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else series.index.to_numpy()
+    keep = lttb(x, series.to_numpy(), threshold)
+    return series.index[keep], series.to_numpy()[keep]
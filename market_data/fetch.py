@@ -0,0 +1,102 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+# 동시에 요청하는 티커 수와 티커당 타임아웃(초)
+MAX_WORKERS = 4
+FETCH_TIMEOUT = 10
+# 세션 간 공유 캐시 유지 시간(초)
+CACHE_TTL = 60 * 60
+
+
+# 스레드 안전한 TTL 캐시 (프로세스당 하나를 만들어 모든 세션이 공유)
+class TTLCache:
+    def __init__(self, ttl=CACHE_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires <= self.clock():
+                del self._items[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = (self.clock() + self.ttl, value)
+
+
+@dataclass
+class FetchResult:
+    frames: dict = field(default_factory=dict)     # 티커 -> OHLCV DataFrame
+    errors: dict = field(default_factory=dict)     # 티커 -> 오류 메시지
+    cached: list = field(default_factory=list)     # 캐시에서 가져온 티커
+    stale: dict = field(default_factory=dict)      # 갱신에 실패해 저장소의 기존 데이터로 대체한 티커 -> 오류 메시지
+
+
+# 'Adj Close'가 없거나 모두 결측이면 'Close'로 대체한 가격 시계열과 사용한 컬럼 이름
+def price_series(df):
+    for column in ('Adj Close', 'Close'):
+        if column in df.columns and df[column].notna().any():
+            return df[column], column
+    return None, None
+
+
+# 여러 티커를 스레드 풀로 동시에 가져옴 (캐시에 있는 티커는 요청하지 않음)
+# store(PriceStore)를 주면 저장소에 없는 날짜 구간만 요청하고 기간 데이터는 디스크에서 읽음
+def fetch_prices(tickers, source, period='1y', cache=None, max_workers=MAX_WORKERS, timeout=FETCH_TIMEOUT, store=None):
+    def load(ticker):
+        if store is None:
+            return source.fetch(ticker, period, None, timeout), None
+        return store.sync(ticker, source, period, timeout)
+
+    result = FetchResult()
+    missing = []
+    for ticker in tickers:
+        frame = cache.get((source.name, ticker, period)) if cache is not None else None
+        if frame is not None:
+            result.frames[ticker] = frame
+            result.cached.append(ticker)
+        else:
+            missing.append(ticker)
+
+    if missing:
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(missing)))
+        futures = {executor.submit(load, ticker): ticker for ticker in missing}
+        # 전체 대기 시간은 (라운드 수 × 티커당 타임아웃)으로 제한
+        rounds = -(-len(missing) // max_workers)
+        try:
+            for future in as_completed(futures, timeout=timeout * rounds + 1):
+                ticker = futures[future]
+                try:
+                    frame, stale_error = future.result()
+                except Exception as e:
+                    result.errors[ticker] = str(e)
+                    continue
+                if stale_error is not None:
+                    result.stale[ticker] = stale_error
+                if frame is None or frame.empty or price_series(frame)[0] is None:
+                    result.errors[ticker] = "데이터가 없거나 'Adj Close'/'Close' 컬럼이 없습니다."
+                    continue
+                result.frames[ticker] = frame
+                if cache is not None and stale_error is None:
+                    cache.set((source.name, ticker, period), frame)
+        except TimeoutError:
+            for future, ticker in futures.items():
+                if not future.done():
+                    result.errors[ticker] = f"{timeout}초 안에 응답이 없습니다."
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # 요청한 티커 순서 유지
+    result.frames = {ticker: result.frames[ticker] for ticker in tickers if ticker in result.frames}
+    result.errors = {ticker: result.errors[ticker] for ticker in tickers if ticker in result.errors}
+    return result
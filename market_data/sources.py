@@ -0,0 +1,77 @@
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+FAKE_HISTORY_START = '2010-01-01'
+PERIOD_DAYS = {'1mo': 31, '3mo': 92, '6mo': 183, '1y': 365, '2y': 730, '5y': 1826, '10y': 3652}
+
+
+# 가격 데이터 소스 인터페이스: fetch()는 날짜 인덱스의 OHLCV DataFrame을 반환 (없으면 빈 DataFrame)
+class PriceSource:
+    name = 'base'
+
+    def fetch(self, ticker, period='1y', start=None, timeout=10):
+        raise NotImplementedError
+
+
+# 야후 파이낸스 (yfinance)
+class YahooPriceSource(PriceSource):
+    name = 'yahoo'
+
+    def fetch(self, ticker, period='1y', start=None, timeout=10):
+        import yfinance as yf
+
+        kwargs = {'start': start} if start is not None else {'period': period}
+        df = yf.download(ticker, threads=False, progress=False, auto_adjust=False, timeout=timeout, **kwargs)
+        # 최신 yfinance는 단일 티커도 (Price, Ticker) MultiIndex 컬럼으로 반환
+        if isinstance(df.columns, pd.MultiIndex):
+            df = df.droplevel(-1, axis=1)
+        return df
+
+
+# 네트워크 없이 테스트/벤치마크에 쓰는 가짜 소스 (티커별로 결정적인 랜덤워크)
+class FakePriceSource(PriceSource):
+    name = 'fake'
+
+    def __init__(self, latency=0.0, end=None, missing=()):
+        self.latency = latency
+        self.end = pd.Timestamp(end).normalize() if end is not None else pd.Timestamp.today().normalize()
+        self.missing = set(missing)
+        self.calls = []
+
+    def fetch(self, ticker, period='1y', start=None, timeout=10):
+        self.calls.append((ticker, period, start))
+        if self.latency:
+            time.sleep(min(self.latency, timeout))
+        if ticker in self.missing:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+
+        # 고정 시작일부터 티커 시드로 이력을 만든 뒤 요청 구간만 잘라서 반환 (같은 날짜는 항상 같은 값)
+        index = pd.bdate_range(start=FAKE_HISTORY_START, end=self.end, name='Date')
+        seed = zlib.crc32(ticker.encode())
+        # 컬럼마다 별도 난수열을 써서 기간이 늘어나도 기존 날짜의 값이 바뀌지 않도록 함
+        close_rng, spread_rng, open_rng, volume_rng = (np.random.default_rng([seed, k]) for k in range(4))
+        close = 100 * np.exp(np.cumsum(close_rng.normal(0.0003, 0.015, len(index))))
+        spread = close * spread_rng.uniform(0.0, 0.01, len(index))
+        df = pd.DataFrame({
+            'Open': close + open_rng.uniform(-1, 1, len(index)) * spread,
+            'High': close + spread,
+            'Low': close - spread,
+            'Close': close,
+            'Adj Close': close,
+            'Volume': volume_rng.integers(1_000_000, 50_000_000, len(index)),
+        }, index=index)
+
+        if start is not None:
+            return df[df.index >= pd.Timestamp(start)]
+        return df[df.index >= self.end - pd.Timedelta(days=PERIOD_DAYS.get(period, 365))]
+
+
+SOURCES = {'yahoo': YahooPriceSource, 'fake': FakePriceSource}
+
+
+def make_source(name='yahoo'):
+    return SOURCES[name]()
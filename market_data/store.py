@@ -0,0 +1,129 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from market_data.sources import PERIOD_DAYS
+
+STORE_PATH = os.path.join(".cache", "market_data", "prices.sqlite")
+# 전체 기간 응답의 첫 날짜가 요청 시작일보다 이만큼 늦어도 기간 전체를 받은 것으로 봄 (주말/연휴)
+COVERAGE_SLACK = pd.Timedelta(days=7)
+
+_COLUMNS = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Adj Close': 'adj_close', 'Volume': 'volume'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, adj_close REAL, volume INTEGER,
+    PRIMARY KEY (ticker, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    ticker TEXT PRIMARY KEY,
+    since TEXT NOT NULL
+);
+"""
+
+
+def _today():
+    return pd.Timestamp.today().normalize()
+
+
+# 티커별 일봉을 저장하는 로컬 SQLite 저장소: 마지막 저장일 이후 구간만 새로 요청
+class PriceStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    # 호출마다 별도 연결을 열고 트랜잭션 커밋/롤백 후 닫음 (fetch_prices의 스레드 풀에서 호출됨)
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # 전체 기간을 요청해 둔 가장 이른 시작일 (이보다 긴 기간을 요청하면 다시 전체 요청)
+    def covered_since(self, ticker):
+        with self._connect() as conn:
+            row = conn.execute("SELECT since FROM coverage WHERE ticker = ?", (ticker,)).fetchone()
+        return pd.Timestamp(row[0]) if row else None
+
+    def last_date(self, ticker):
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(date) FROM prices WHERE ticker = ?", (ticker,)).fetchone()
+        return pd.Timestamp(row[0]) if row and row[0] else None
+
+    # 날짜 기준으로 병합 (같은 날짜는 새 값으로 교체되어 중복 없음)
+    def upsert(self, ticker, df):
+        if df is None or df.empty:
+            return 0
+        df = df.rename(columns=_COLUMNS).reindex(columns=list(_COLUMNS.values()))
+        df = df[df['close'].notna()]
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        rows = [
+            (ticker, date, *[None if pd.isna(v) else float(v) for v in values[:-1]],
+             None if pd.isna(values[-1]) else int(values[-1]))
+            for date, values in zip(index.strftime('%Y-%m-%d'), df.itertuples(index=False))
+        ]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    # 저장된 일봉 중 start 이후 구간 (fetch 결과와 같은 컬럼 이름)
+    def window(self, ticker, start=None):
+        query = "SELECT date, open, high, low, close, adj_close, volume FROM prices WHERE ticker = ?"
+        params = [ticker]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        with self._connect() as conn:
+            df = pd.read_sql_query(query + " ORDER BY date", conn, params=params, parse_dates=['date'])
+        df = df.set_index('date').rename(columns={v: k for k, v in _COLUMNS.items()})
+        df.index.name = 'Date'
+        # 소스가 주지 않은 열(예: 수정 종가)은 전부 NULL이므로 빼서 원래 응답과 같은 모양으로 반환
+        return df.dropna(axis=1, how='all') if len(df) else df
+
+    # 전체 기간 응답이 시작일 근처부터 있을 때만 start부터 보유한 것으로 기록
+    # (상장일이 늦는 등 더 늦게 시작하면 실제 첫 날짜로 기록해 같은 기간 요청 시 다시 전체 요청)
+    def _record_coverage(self, ticker, start, df):
+        index = pd.DatetimeIndex(df.index)
+        first = (index.tz_localize(None) if index.tz is not None else index).min().normalize()
+        since = start if first <= start + COVERAGE_SLACK else first
+        previous = self.covered_since(ticker)
+        if previous is not None:
+            since = min(since, previous)
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO coverage VALUES (?, ?)", (ticker, since.strftime('%Y-%m-%d')))
+
+    # 부족한 구간만 받아 병합한 뒤 요청 기간을 디스크에서 반환
+    # 반환값: (DataFrame, 오류 메시지 또는 None) — 요청이 실패해도 저장된 데이터가 있으면 그것을 반환
+    def sync(self, ticker, source, period='1y', timeout=10):
+        start = _today() - pd.Timedelta(days=PERIOD_DAYS.get(period, 365))
+        since = self.covered_since(ticker)
+        last = self.last_date(ticker) if since is not None and since <= start else None
+        error = None
+        if last is None or last < _today():
+            try:
+                # 마지막 저장일도 다시 받아 장중에 저장된 값을 갱신 (last가 None이면 기간 전체)
+                df = source.fetch(ticker, period, last, timeout)
+                if last is None:
+                    # 요청 제한 등으로 빈 응답이 오면 예외 없이 끝나므로 오류로 처리 (보유 구간을 늘려 기록하지 않음)
+                    if df is None or df.empty:
+                        raise ValueError(f"{period} 기간 데이터가 비어 있습니다.")
+                    self.upsert(ticker, df)
+                    self._record_coverage(ticker, start, df)
+                else:
+                    self.upsert(ticker, df)
+            except Exception as e:
+                if self.last_date(ticker) is None:
+                    raise
+                error = str(e)
+        return self.window(ticker, start), error
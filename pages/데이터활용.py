@@ -1,96 +1,82 @@
+import os
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
-import re
-
-# 데이터 클리닝 함수: 숫자로 변환 (쉼표 제거)
-def clean_population_data(value):
-    if isinstance(value, str):
-        return int(value.replace(',', ''))
-    return value
-
-# 행정구역 이름 정리 함수 (예: "서울특별시  (1100000000)" -> "서울특별시")
-def clean_admin_district_name(name):
-    if isinstance(name, str):
-        match = re.match(r"([^(]+)\s*\(", name)
-        if match:
-            return match.group(1).strip()
-    return name
+
+from population.binning import BIN_PRESETS, DEFAULT_PRESET, binning_for
+from population.admin import LEVEL_NAMES
+from population.choropleth import BOUNDARY_GEOJSON, choropleth_figure, join_features, load_boundaries
+from population.figures import (FIGURE_CACHE_SIZE, FigureCache, age_distribution_bar, compare_dependency, compare_pyramids,
+                                compare_structure, population_pyramid, structure_pie)
+from population.profiling import PROFILE_LOG, RerunProfiler, read_log, summarize
+from population.structure import band_totals, population_structure_table
+from population.tensor import SEXES, load_tensor
+from population.timeseries import ingest_directory, open_store
 
 # 데이터 로드 및 전처리 함수 (URL 지원)
-@st.cache_data # 데이터 로딩 결과를 캐시하여 성능 향상
-def load_data(url, is_gender_separated=False):
+# 두 CSV를 행정구역 × 성별 × 연령 int32 텐서 하나로 통합하고, 디스크 스냅샷을 메모리 매핑해
+# 프로세스당 한 번만 보관 (cache_resource는 세션마다 복사본을 만들지 않고 같은 읽기 전용 객체를 공유)
+@st.cache_resource
+def load_data(total_url, gender_url):
     try:
-        df = pd.read_csv(url, encoding='cp949') # 한글 인코딩 문제 방지
-    except UnicodeDecodeError:
-        df = pd.read_csv(url, encoding='utf-8')
+        return load_tensor(total_url, gender_url)
     except Exception as e: # URL 접근 오류 등 다양한 예외 처리
-        st.error(f"데이터를 불러오는 중 오류 발생: {url}")
+        st.error(f"데이터를 불러오는 중 오류 발생: {total_url}, {gender_url}")
         st.error(f"오류 메시지: {e}")
         st.error("GitHub Raw URL이 정확한지, 파일이 공개되어 있는지 확인해주세요.")
         return None
 
-    if df is None: # 파일 로드 실패 시
-        return None
-
-    # 첫 번째 열 이름을 '행정구역'으로 표준화 (실제 파일에 따라 다를 수 있음)
-    if df.columns[0] != '행정구역':
-        df.rename(columns={df.columns[0]: '행정구역'}, inplace=True)
-
-    df['행정구역'] = df['행정구역'].apply(clean_admin_district_name)
-    df.set_index('행정구역', inplace=True)
-
-    # 인구수 데이터 클리닝
-    for col in df.columns:
-        if '인구수' in col or '세' in col: # 총인구수, 연령구간인구수, 0세, 1세 등
-            df[col] = df[col].apply(clean_population_data)
-    return df
-
-# 연령 컬럼 추출 함수
-def get_age_columns(df_columns, prefix):
-    age_cols = []
-    for col in df_columns:
-        if col.startswith(prefix) and (col.endswith('세') or col.endswith('세 이상')):
-            if '연령구간인구수' not in col and '총인구수' not in col : # 전체 합계 컬럼 제외
-                 age_cols.append(col)
-    # '0세', '1세', ..., '100세 이상' 순으로 정렬하기 위한 키 함수
-    def age_sort_key(col_name):
-        age_part = col_name.replace(prefix, '').replace('세', '').replace(' 이상', '')
-        return int(age_part) if age_part.isdigit() else 101 # '100세 이상'을 가장 뒤로
-    
-    return sorted(age_cols, key=age_sort_key)
-
-# 연령대별 인구 집계 함수
-def get_population_by_age_category(age_population_series):
-    youth_pop = 0  # 0-14세
-    working_age_pop = 0  # 15-64세
-    elderly_pop = 0  # 65세 이상
-
-    for age_label, pop in age_population_series.items():
-        try:
-            age_numeric_str_match = re.match(r"(\d+)", age_label)
-            if age_numeric_str_match:
-                age = int(age_numeric_str_match.group(1))
-            else: 
-                st.warning(f"연령 라벨 '{age_label}'에서 숫자 부분을 추출하지 못했습니다. 이 데이터는 집계에서 제외됩니다.")
-                continue
-
-            if 0 <= age <= 14:
-                youth_pop += pop
-            elif 15 <= age <= 64:
-                working_age_pop += pop
-            elif age >= 65: 
-                elderly_pop += pop
-        except ValueError:
-            st.warning(f"연령 라벨 '{age_label}'을(를) 처리하는 중 오류 발생. 이 데이터는 집계에서 제외됩니다.")
-            continue
-            
+# 연령대별 인구 집계 함수 (연령대 마스크와의 행렬곱으로 계산)
+def get_population_by_age_category(age_population, ages):
+    youth_pop, working_age_pop, elderly_pop = band_totals(np.asarray(age_population)[None, :], ages)[0]
     total_pop_for_categories = youth_pop + working_age_pop + elderly_pop
     return youth_pop, working_age_pop, elderly_pop, total_pop_for_categories
 
+# 전국 행정구역 인구 구조 표 (데이터 버전마다 한 번만 계산해 모든 세션이 공유, 읽기 전용으로 사용)
+@st.cache_resource
+def get_structure_table(_population, version):
+    df_structure_all = population_structure_table(
+        _population.values[:, 0],
+        _population.ages,
+        index=_population.districts,
+        male_total=_population.totals[:, 1],
+        female_total=_population.totals[:, 2],
+    )
+    df_structure_all.insert(0, '단계', [LEVEL_NAMES[level] for level in _population.tree.level])
+    return df_structure_all
+
+# 만든 Plotly 그림을 (행정구역, 구간 설정, 데이터 버전)별로 보관하는 크기 제한 LRU 캐시
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(FIGURE_CACHE_SIZE)
+
+# 행정경계 단계구분도: 경계 파일을 단순화해 행정코드로 텐서 행과 한 번만 연결하고 지표별 색 구간을 미리 계산
+# (경계 파일 / 데이터 버전마다 한 번 만들어 모든 세션이 같은 그림을 공유)
+@st.cache_resource
+def get_choropleth(_population, version, boundary_path, boundary_mtime, code_property):
+    boundaries = load_boundaries(boundary_path)
+    join = join_features(boundaries, _population.tree.positions, code_property)
+    return join, choropleth_figure(join, get_structure_table(_population, version), _population.districts)
+
+# 월별 시계열 저장소: 아직 수집하지 않은 월의 CSV만 청크 단위로 추가하고, 조회는 메모리 매핑으로 필요한 행만 읽음
+@st.cache_resource(ttl=600)
+def load_timeseries(source_dir):
+    try:
+        ingest_directory(source_dir)
+    except Exception as e:
+        st.warning(f"월별 데이터를 수집하는 중 오류 발생: {e}")
+    return open_store()
+
 # --- 스트림릿 앱 UI 구성 ---
 st.set_page_config(layout="wide", page_title="대한민국 인구 현황 대시보드")
+
+# 재실행마다 구간별 소요 시간을 측정해 로그에 기록 (?debug=1이면 사이드바에 진단 패널 표시)
+debug_mode = st.query_params.get("debug") == "1"
+trace_memory = debug_mode and st.sidebar.checkbox("메모리 할당 추적 (느려짐)", key="profile_trace_memory")
+profiler = RerunProfiler("데이터활용", trace_memory=trace_memory)
+profiler.mark("페이지 준비")
 st.title("📊 대한민국 월별 연령별 인구 현황")
 st.markdown("""
 이 대시보드는 GitHub에 업로드된 CSV 데이터를 기반으로 대한민국 행정구역별 인구 현황을 보여줍니다.
@@ -102,6 +88,13 @@ st.markdown("""
 # 예시: GITHUB_TOTAL_POP_URL = "https://raw.githubusercontent.com/your_username/your_repository/main/path/to/your_total_pop_file.csv"
 GITHUB_TOTAL_POP_URL = "202504_202504_연령별인구현황_월간_남녀합계.csv" # 예시 URL, 실제 URL로 변경 필요
 GITHUB_GENDER_POP_URL = "202504_202504_연령별인구현황_월간 _남녀구분.csv" # 예시 URL, 실제 URL로 변경 필요
+# 월별 CSV(…_연령별인구현황_…csv)를 모아 두는 디렉터리 (새 월 파일을 추가하면 추이 분석에 반영)
+MONTHLY_CSV_DIR = "."
+# 지역 비교에서 한 번에 고를 수 있는 최대 행정구역 수
+MAX_COMPARE_DISTRICTS = 50
+# 지도에 쓸 행정경계 GeoJSON과 행정코드 속성 이름 (속성 이름을 비우면 자동 감지)
+BOUNDARY_GEOJSON_PATH = os.environ.get("POPULATION_GEOJSON", BOUNDARY_GEOJSON)
+BOUNDARY_CODE_PROPERTY = os.environ.get("POPULATION_GEOJSON_CODE_PROPERTY") or None
 
 st.sidebar.markdown("### 데이터 소스")
 st.sidebar.info(f"""
@@ -112,264 +105,299 @@ st.sidebar.info(f"""
 """)
 
 
-df_total_pop = load_data(GITHUB_TOTAL_POP_URL)
-df_gender_pop = load_data(GITHUB_GENDER_POP_URL, is_gender_separated=True)
+profiler.mark("데이터 로드")
+population = load_data(GITHUB_TOTAL_POP_URL, GITHUB_GENDER_POP_URL)
 
 
-if df_total_pop is not None and df_gender_pop is not None:
-    admin_districts = df_total_pop.index.tolist()
-    if not admin_districts:
+if population is not None:
+    admin_tree = population.tree
+    if len(admin_tree.children()) == 0:
         st.error("데이터에서 행정구역 정보를 찾을 수 없습니다. CSV 파일 형식을 확인해주세요.")
     else:
-        selected_district = st.sidebar.selectbox("행정구역 선택", admin_districts)
+        profiler.mark("행정구역 선택")
+        # 이름 검색: 단어 앞부분 또는 초성(예: 'ㅅㅇ', '부산 ㅎㅇ')으로 찾고 일치하는 일부만 선택 목록으로 보냄
+        district_query = st.sidebar.text_input("행정구역 검색", placeholder="예: 종로, ㅅㅇ, 부산 ㅎㅇ")
+        search_rows = population.search_index.search(district_query).tolist() if district_query.strip() else []
+        if district_query.strip() and not search_rows:
+            st.sidebar.warning(f"'{district_query}'와(과) 일치하는 행정구역이 없습니다.")
+
+        # 검색 결과가 없으면 시도 → 시군구 → 읍면동 순으로 선택한 행정구역의 하위 목록만 조회
+        district_row = -1
+        if search_rows:
+            district_row = st.sidebar.selectbox("검색 결과", search_rows, format_func=admin_tree.label, key="district_search")
+        else:
+            for depth in range(1, int(admin_tree.depth.max()) + 1):
+                child_rows = admin_tree.children(district_row).tolist()
+                if not child_rows:
+                    break
+                parent_row = district_row
+                options = child_rows if parent_row < 0 else [parent_row] + child_rows
+                district_row = st.sidebar.selectbox(
+                    "행정구역 선택" if parent_row < 0 else "하위 행정구역",
+                    options,
+                    format_func=lambda row, parent_row=parent_row: "(전체)" if row == parent_row else admin_tree.label(row),
+                    key=f"district_{depth}_{parent_row}",
+                )
+                if district_row == parent_row:
+                    break
+        selected_district = admin_tree.label(district_row)
 
         st.header(f"📍 {selected_district} 인구 현황")
 
-        date_prefix_total = ""
-        if df_total_pop.columns[0].startswith("20"):
-            date_prefix_total = df_total_pop.columns[0].split('_')[0] + "_"
-        
-        date_prefix_gender_male = ""
-        date_prefix_gender_female = ""
-        for col in df_gender_pop.columns:
-            if col.startswith("20") and "_남_" in col:
-                date_prefix_gender_male = col.split('_남_')[0] + "_남_"
-                break
-        for col in df_gender_pop.columns:
-            if col.startswith("20") and "_여_" in col:
-                date_prefix_gender_female = col.split('_여_')[0] + "_여_"
-                break
-
         if not selected_district:
             st.warning("분석할 행정구역을 선택해주세요.")
         else:
             try:
                 # 1. 총 인구수 (남녀 합계 데이터)
+                profiler.mark("1. 총 인구 정보")
                 st.subheader("1. 총 인구 정보")
-                total_pop_col_name = f"{date_prefix_total.replace('_','')}계_총인구수"
-                if total_pop_col_name not in df_total_pop.columns:
-                    potential_cols = [col for col in df_total_pop.columns if '_계_총인구수' in col]
-                    if potential_cols:
-                        total_pop_col_name = potential_cols[0]
-                    else:
-                        st.error("총 인구수 컬럼을 찾을 수 없습니다.")
-                        total_pop_col_name = None
-
-                current_total_population = 0
-                if total_pop_col_name:
-                    current_total_population = df_total_pop.loc[selected_district, total_pop_col_name]
-                    st.metric(label=f"{selected_district} 총 인구수 ({date_prefix_total.replace('_','')})", value=f"{current_total_population:,.0f} 명")
-
-                # '계'가 포함된 연령 컬럼 prefix 찾기
-                age_col_prefix_total = ""
-                for col in df_total_pop.columns:
-                    if col.startswith(date_prefix_total.replace('_','')) and "_계_" in col and "세" in col:
-                         age_col_prefix_total = col.split('0세')[0] 
-                         break
-                if not age_col_prefix_total and date_prefix_total:
-                    age_col_prefix_total = date_prefix_total + "계_"
+                current_total_population = population.totals[district_row, 0]
+                st.metric(label=f"{selected_district} 총 인구수 ({population.month})", value=f"{current_total_population:,.0f} 명")
+
+                total_ages = population.ages
+                age_population_total = pd.Series(population.values[district_row, 0], index=population.age_labels)
+
+                # 연령 구간은 분포/피라미드 탭이 함께 쓰는 사이드바 설정
+                bin_preset = st.sidebar.selectbox("연령 구간", list(BIN_PRESETS), index=list(BIN_PRESETS).index(DEFAULT_PRESET))
+                bin_edges = BIN_PRESETS[bin_preset]
+                district_code = int(population.codes[district_row])
+                df_structure_all = get_structure_table(population, population.version)
+                figure_cache = get_figure_cache()
+
+                # 섹션은 탭으로 나누고 선택한 탭만 계산 (탭을 바꾸면 다시 실행되어 그 탭만 그림)
+                section_tabs = st.tabs(["인구 구조", "연령 분포", "성별 · 피라미드", "데이터 보기", "전국 순위", "하위 행정구역", "월별 추이", "지역 비교", "지도"],
+                                       key="population_section", on_change="rerun")
+
+                with section_tabs[0]:
+                    if section_tabs[0].open:
+                        # 2. 인구 구조 분석
+                        profiler.mark("2. 인구 구조 분석")
+                        st.subheader("2. 인구 구조 분석")
+                        if age_population_total is not None and not age_population_total.empty:
+                            youth_pop, working_age_pop, elderly_pop, sum_categories = get_population_by_age_category(age_population_total.to_numpy(), total_ages)
+
+                            if sum_categories > 0 : 
+                                youth_ratio = (youth_pop / sum_categories) * 100
+                                working_age_ratio = (working_age_pop / sum_categories) * 100
+                                elderly_ratio = (elderly_pop / sum_categories) * 100
+
+                                st.markdown("#### 연령대별 인구 비율")
+                                col_struct1, col_struct2, col_struct3 = st.columns(3)
+                                col_struct1.metric("유소년인구 (0-14세)", f"{youth_ratio:.1f}%", f"{youth_pop:,.0f} 명")
+                                col_struct2.metric("생산가능인구 (15-64세)", f"{working_age_ratio:.1f}%", f"{working_age_pop:,.0f} 명")
+                                col_struct3.metric("고령인구 (65세 이상)", f"{elderly_ratio:.1f}%", f"{elderly_pop:,.0f} 명")
+
+                                fig_structure_pie = figure_cache.get(
+                                    ('structure', district_code, None, population.version),
+                                    lambda: structure_pie(selected_district, youth_pop, working_age_pop, elderly_pop))
+                                st.plotly_chart(fig_structure_pie, use_container_width=True)
+                            else:
+                                st.warning("인구 구조 분석을 위한 데이터가 충분하지 않거나 총 인구가 0입니다.")
+                        else:
+                            st.warning("연령별 인구 데이터를 찾을 수 없어 인구 구조 분석을 할 수 없습니다. (남녀 합계 데이터)")
+
+                with section_tabs[1]:
+                    if section_tabs[1].open:
+                        # 3. 연령별 인구 분포 (전체)
+                        profiler.mark("3. 연령별 인구 분포 (전체)")
+                        st.subheader("3. 연령별 인구 분포 (전체)")
+                        if age_population_total is not None and not age_population_total.empty:
+                            def build_age_distribution():
+                                binning_total = binning_for(population.ages, bin_edges)
+                                age_population_total_grouped = pd.Series(binning_total.aggregate(age_population_total.to_numpy()),
+                                                                         index=binning_total.labels)
+                                return age_distribution_bar(selected_district, age_population_total_grouped, bin_preset)
+                            fig_age_dist_total = figure_cache.get(('distribution', district_code, bin_preset, population.version),
+                                                                  build_age_distribution)
+                            st.plotly_chart(fig_age_dist_total, use_container_width=True)
+                        else:
+                            st.warning("연령별 인구 데이터를 찾을 수 없습니다. (남녀 합계 데이터)")
+
+                with section_tabs[2]:
+                    if section_tabs[2].open:
+                        # 4. 성별 인구 정보
+                        profiler.mark("4. 성별 인구 정보")
+                        st.subheader("4. 성별 인구 정보")
+                        male_population = population.totals[district_row, 1]
+                        female_population = population.totals[district_row, 2]
+
+                        col1, col2, col3 = st.columns(3)
+                        col1.metric(label=f"남성 총 인구수 ({population.month})", value=f"{male_population:,.0f} 명")
+                        col2.metric(label=f"여성 총 인구수 ({population.month})", value=f"{female_population:,.0f} 명")
+
+                        if female_population > 0:
+                            sex_ratio = (male_population / female_population) * 100
+                            col3.metric(label="성비 (여성 100명당 남성 수)", value=f"{sex_ratio:.1f} 명")
+                        else:
+                            col3.metric(label="성비", value="N/A (여성 인구 0)")
+
+                        # 5. 인구 피라미드
+                        profiler.mark("5. 인구 피라미드")
+                        st.subheader("5. 인구 피라미드")
+                        binning_pyramid = binning_for(population.ages, bin_edges)
+
+                        if binning_pyramid.size > 0:
+                            def build_pyramid():
+                                # 남녀 연령 벡터를 한 번에 구간 집계 (2 × 연령 행렬 뷰)
+                                male_grouped, female_grouped = binning_pyramid.aggregate(population.values[district_row, 1:])
+                                return population_pyramid(selected_district, binning_pyramid.labels, male_grouped, female_grouped, bin_preset)
+                            fig_pyramid = figure_cache.get(('pyramid', district_code, bin_preset, population.version), build_pyramid)
+                            st.plotly_chart(fig_pyramid, use_container_width=True)
+                        else:
+                            st.warning("인구 피라미드를 그릴 데이터가 부족합니다.")
+
+                with section_tabs[3]:
+                    if section_tabs[3].open:
+                        # 6. 데이터 테이블 표시
+                        profiler.mark("6. 데이터 보기")
+                        st.subheader("6. 데이터 보기")
+                        show_total_data = st.checkbox("남녀 합계 데이터 테이블 보기")
+                        if show_total_data:
+                            st.dataframe(population.frame(district_row, sexes=('계',)))
                 
-                total_age_cols = get_age_columns(df_total_pop.columns, age_col_prefix_total)
-                age_population_total = None
-                if total_age_cols:
-                    age_population_total = df_total_pop.loc[selected_district, total_age_cols]
-                    age_population_total.index = [col.replace(age_col_prefix_total, '') for col in total_age_cols]
-
-                # 2. 인구 구조 분석
-                st.subheader("2. 인구 구조 분석")
-                if age_population_total is not None and not age_population_total.empty:
-                    youth_pop, working_age_pop, elderly_pop, sum_categories = get_population_by_age_category(age_population_total)
-
-                    if sum_categories > 0 : 
-                        youth_ratio = (youth_pop / sum_categories) * 100
-                        working_age_ratio = (working_age_pop / sum_categories) * 100
-                        elderly_ratio = (elderly_pop / sum_categories) * 100
-
-                        st.markdown("#### 연령대별 인구 비율")
-                        col_struct1, col_struct2, col_struct3 = st.columns(3)
-                        col_struct1.metric("유소년인구 (0-14세)", f"{youth_ratio:.1f}%", f"{youth_pop:,.0f} 명")
-                        col_struct2.metric("생산가능인구 (15-64세)", f"{working_age_ratio:.1f}%", f"{working_age_pop:,.0f} 명")
-                        col_struct3.metric("고령인구 (65세 이상)", f"{elderly_ratio:.1f}%", f"{elderly_pop:,.0f} 명")
-
-                        structure_data = {
-                            '구분': ['유소년인구 (0-14세)', '생산가능인구 (15-64세)', '고령인구 (65세 이상)'],
-                            '인구수': [youth_pop, working_age_pop, elderly_pop]
-                        }
-                        df_structure = pd.DataFrame(structure_data)
-                        fig_structure_pie = px.pie(df_structure, names='구분', values='인구수', 
-                                                   title=f'{selected_district} 인구 구조',
-                                                   color_discrete_sequence=px.colors.qualitative.Pastel)
-                        fig_structure_pie.update_traces(textinfo='percent+label', insidetextorientation='radial')
-                        st.plotly_chart(fig_structure_pie, use_container_width=True)
-                    else:
-                        st.warning("인구 구조 분석을 위한 데이터가 충분하지 않거나 총 인구가 0입니다.")
-                else:
-                    st.warning(f"'{age_col_prefix_total}'로 시작하는 연령별 인구 데이터를 찾을 수 없어 인구 구조 분석을 할 수 없습니다. (남녀 합계 데이터)")
-
-                # 3. 연령별 인구 분포 (전체)
-                st.subheader("3. 연령별 인구 분포 (전체)")
-                group_ages = st.sidebar.checkbox("연령대별 그룹화 (10세 단위)", value=True) 
-
-                if age_population_total is not None and not age_population_total.empty:
-                    if group_ages:
-                        try:
-                            max_age_val = age_population_total.index.map(lambda x: int(re.sub(r'[^0-9]', '', x))).max()
-                            bins = list(range(0, 101, 10)) + [max_age_val + 1]
-                            labels = [f"{bins[i]}-{bins[i+1]-1}세" for i in range(len(bins)-2)] + [f"{bins[-2]}세 이상"]
-                            
-                            age_population_total_grouped = pd.Series(index=labels, dtype='int64').fillna(0)
-                            for age_str, pop in age_population_total.items():
-                                age_val = int(re.sub(r'[^0-9]', '', age_str)) 
-                                for i in range(len(bins)-1):
-                                    if bins[i] <= age_val < bins[i+1]:
-                                        age_population_total_grouped[labels[i]] += pop
-                                        break
-                            fig_age_dist_total = px.bar(age_population_total_grouped, 
-                                                        x=age_population_total_grouped.index, 
-                                                        y=age_population_total_grouped.values,
-                                                        labels={'x': '연령대', 'y': '인구수'},
-                                                        title=f"{selected_district} 연령대별 인구 분포")
-                        except Exception as e:
-                            st.error(f"연령대별 그룹화 중 오류 발생: {e}")
-                            fig_age_dist_total = None 
-                    else:
-                        fig_age_dist_total = px.bar(age_population_total, 
-                                                    x=age_population_total.index, 
-                                                    y=age_population_total.values,
-                                                    labels={'x': '연령', 'y': '인구수'},
-                                                    title=f"{selected_district} 세부 연령별 인구 분포")
-                    if fig_age_dist_total:
-                        fig_age_dist_total.update_layout(xaxis_title="연령(대)", yaxis_title="인구수")
-                        st.plotly_chart(fig_age_dist_total, use_container_width=True)
-                else:
-                    st.warning(f"'{age_col_prefix_total}'로 시작하는 연령별 인구 데이터를 찾을 수 없습니다. (남녀 합계 데이터)")
-
-                # 4. 성별 인구 정보
-                st.subheader("4. 성별 인구 정보")
-                male_total_col = f"{date_prefix_gender_male.replace('_남_','')}남_총인구수"
-                female_total_col = f"{date_prefix_gender_female.replace('_여_','')}여_총인구수"
-
-                if male_total_col not in df_gender_pop.columns:
-                    potential_cols = [col for col in df_gender_pop.columns if '_남_총인구수' in col]
-                    if potential_cols: male_total_col = potential_cols[0]
-                    else: male_total_col = None
-                
-                if female_total_col not in df_gender_pop.columns:
-                    potential_cols = [col for col in df_gender_pop.columns if '_여_총인구수' in col]
-                    if potential_cols: female_total_col = potential_cols[0]
-                    else: female_total_col = None
-
-                male_population = 0
-                female_population = 0
-
-                if male_total_col and female_total_col:
-                    male_population = df_gender_pop.loc[selected_district, male_total_col]
-                    female_population = df_gender_pop.loc[selected_district, female_total_col]
-
-                    col1, col2, col3 = st.columns(3)
-                    col1.metric(label=f"남성 총 인구수 ({date_prefix_gender_male.split('_')[0]})", value=f"{male_population:,.0f} 명")
-                    col2.metric(label=f"여성 총 인구수 ({date_prefix_gender_female.split('_')[0]})", value=f"{female_population:,.0f} 명")
-                    
-                    if female_population > 0:
-                        sex_ratio = (male_population / female_population) * 100
-                        col3.metric(label="성비 (여성 100명당 남성 수)", value=f"{sex_ratio:.1f} 명")
-                    else:
-                        col3.metric(label="성비", value="N/A (여성 인구 0)")
-                else:
-                    st.warning("남성 또는 여성 총 인구수 컬럼명을 데이터에서 찾을 수 없습니다. (남녀 구분 데이터)")
-
-                # 5. 인구 피라미드
-                st.subheader("5. 인구 피라미드")
-                male_age_cols = get_age_columns(df_gender_pop.columns, date_prefix_gender_male)
-                female_age_cols = get_age_columns(df_gender_pop.columns, date_prefix_gender_female)
-
-                if not male_age_cols or not female_age_cols:
-                    st.warning("남성 또는 여성 연령별 인구 데이터를 찾을 수 없습니다. (남녀 구분 데이터)")
-                else:
-                    male_age_pop = df_gender_pop.loc[selected_district, male_age_cols].rename(lambda x: x.replace(date_prefix_gender_male, ''))
-                    female_age_pop = df_gender_pop.loc[selected_district, female_age_cols].rename(lambda x: x.replace(date_prefix_gender_female, ''))
-                    
-                    age_labels_raw = [col.replace(date_prefix_gender_male, '') for col in male_age_cols] 
-                    
-                    if group_ages:
-                        try:
-                            max_age_val_pyramid = max(
-                                male_age_pop.index.map(lambda x: int(re.sub(r'[^0-9]', '', x))).max(),
-                                female_age_pop.index.map(lambda x: int(re.sub(r'[^0-9]', '', x))).max() 
-                            )
-                            bins_pyramid = list(range(0, 101, 10)) + [max_age_val_pyramid + 1]
-                            labels_pyramid = [f"{bins_pyramid[i]}-{bins_pyramid[i+1]-1}세" for i in range(len(bins_pyramid)-2)] + [f"{bins_pyramid[-2]}세 이상"]
-                            
-                            male_age_pop_grouped = pd.Series(index=labels_pyramid, dtype='int64').fillna(0)
-                            female_age_pop_grouped = pd.Series(index=labels_pyramid, dtype='int64').fillna(0)
-
-                            for age_str, pop in male_age_pop.items():
-                                age_val = int(re.sub(r'[^0-9]', '', age_str))
-                                for i in range(len(bins_pyramid)-1):
-                                    if bins_pyramid[i] <= age_val < bins_pyramid[i+1]:
-                                        male_age_pop_grouped[labels_pyramid[i]] += pop
-                                        break
-                            for age_str, pop in female_age_pop.items():
-                                age_val = int(re.sub(r'[^0-9]', '', age_str))
-                                for i in range(len(bins_pyramid)-1):
-                                    if bins_pyramid[i] <= age_val < bins_pyramid[i+1]:
-                                        female_age_pop_grouped[labels_pyramid[i]] += pop
-                                        break
-                            y_labels = labels_pyramid
-                            male_data = male_age_pop_grouped
-                            female_data = female_age_pop_grouped
-                        except Exception as e:
-                            st.error(f"인구 피라미드 그룹화 중 오류 발생: {e}")
-                            y_labels, male_data, female_data = age_labels_raw, male_age_pop, female_age_pop 
-                    else: 
-                        y_labels = age_labels_raw
-                        male_data = male_age_pop
-                        female_data = female_age_pop
-
-                    if not male_data.empty and not female_data.empty:
-                        fig_pyramid = go.Figure()
-                        fig_pyramid.add_trace(go.Bar(
-                            y=y_labels,
-                            x=-male_data.values, 
-                            name='남성',
-                            orientation='h',
-                            marker=dict(color='cornflowerblue')
-                        ))
-                        fig_pyramid.add_trace(go.Bar(
-                            y=y_labels,
-                            x=female_data.values,
-                            name='여성',
-                            orientation='h',
-                            marker=dict(color='lightcoral')
-                        ))
-                        
-                        max_abs_pop = max(abs(male_data.min()), male_data.max(), abs(female_data.min()), female_data.max()) if not male_data.empty and not female_data.empty else 1000
-
-                        fig_pyramid.update_layout(
-                            title=f'{selected_district} 인구 피라미드{" (10세 단위)" if group_ages else " (세부 연령)"}',
-                            yaxis_title='연령(대)',
-                            xaxis_title='인구수',
-                            barmode='relative', 
-                            bargap=0.1,
-                            xaxis=dict(
-                                tickvals=[-max_abs_pop, 0, max_abs_pop], 
-                                ticktext=[f"{max_abs_pop:,.0f}", "0", f"{max_abs_pop:,.0f}"] 
-                            ),
-                            legend_title_text='성별'
+                        show_gender_data = st.checkbox("남녀 구분 데이터 테이블 보기")
+                        if show_gender_data:
+                            st.dataframe(population.frame(district_row, sexes=('남', '여')))
+
+                with section_tabs[4]:
+                    if section_tabs[4].open:
+                        # 7. 전국 인구 구조 순위
+                        profiler.mark("7. 전국 인구 구조 순위")
+                        st.subheader("7. 전국 인구 구조 순위")
+
+                        col_rank1, col_rank2, col_rank3, col_rank4, col_rank5 = st.columns(5)
+                        rank_metric = col_rank1.selectbox("정렬 기준", df_structure_all.columns[1:].tolist(),
+                                                          index=df_structure_all.columns.get_loc('고령비율(%)'))
+                        rank_ascending = col_rank2.radio("정렬 순서", ["내림차순", "오름차순"], horizontal=True) == "오름차순"
+                        rank_top_n = col_rank3.number_input("표시 개수", min_value=1, max_value=len(df_structure_all), value=min(50, len(df_structure_all)))
+                        rank_name_filter = col_rank4.text_input("행정구역 이름 필터", placeholder="예: 서울특별시")
+                        rank_levels = col_rank5.multiselect("행정 단계", list(LEVEL_NAMES.values()), default=list(LEVEL_NAMES.values()))
+
+                        df_rank = df_structure_all[df_structure_all['단계'].isin(rank_levels)]
+                        if rank_name_filter:
+                            df_rank = df_rank[df_rank.index.str.contains(rank_name_filter, regex=False)]
+                        df_rank = df_rank.sort_values(rank_metric, ascending=rank_ascending).head(int(rank_top_n))
+                        st.dataframe(df_rank.style.format(precision=1, thousands=','), use_container_width=True)
+
+                with section_tabs[5]:
+                    if section_tabs[5].open:
+                        # 8. 하위 행정구역 및 합계 검증
+                        profiler.mark("8. 하위 행정구역 및 합계 검증")
+                        st.subheader("8. 하위 행정구역 및 합계 검증")
+                        child_rows = admin_tree.children(district_row)
+                        if len(child_rows) > 0:
+                            st.markdown(f"#### {selected_district}의 하위 행정구역 ({len(child_rows)}곳)")
+                            rolled_up_total = admin_tree.roll_up(population.totals[:, 0])[district_row]
+                            st.caption(f"말단 행정구역 합산 인구: {rolled_up_total:,.0f} 명 / 보고된 총 인구: {current_total_population:,.0f} 명")
+                            st.dataframe(df_structure_all.iloc[child_rows].style.format(precision=1, thousands=','), use_container_width=True)
+                        else:
+                            st.info(f"{selected_district}은(는) 하위 행정구역이 없는 말단 행정구역입니다.")
+
+                        df_mismatch = pd.concat(
+                            [admin_tree.consistency(population.totals[:, i]).assign(성별=sex) for i, sex in enumerate(SEXES)],
+                            ignore_index=True,
                         )
-                        st.plotly_chart(fig_pyramid, use_container_width=True)
-                    else:
-                        st.warning("인구 피라미드를 그릴 데이터가 부족합니다.")
-
-                # 6. 데이터 테이블 표시
-                st.subheader("6. 데이터 보기")
-                show_total_data = st.checkbox("남녀 합계 데이터 테이블 보기")
-                if show_total_data:
-                    st.dataframe(df_total_pop.loc[[selected_district]])
-                
-                show_gender_data = st.checkbox("남녀 구분 데이터 테이블 보기")
-                if show_gender_data:
-                    st.dataframe(df_gender_pop.loc[[selected_district]])
+                        if df_mismatch.empty:
+                            st.success("모든 상위 행정구역의 총인구수가 하위 행정구역 합계와 일치합니다.")
+                        else:
+                            st.warning(f"상위 행정구역 총인구수와 하위 합계가 다른 항목이 {len(df_mismatch)}건 있습니다.")
+                            st.dataframe(df_mismatch, use_container_width=True)
+
+                with section_tabs[6]:
+                    if section_tabs[6].open:
+                        # 9. 월별 추이
+                        profiler.mark("9. 월별 추이")
+                        st.subheader("9. 월별 추이")
+                        timeseries = load_timeseries(MONTHLY_CSV_DIR)
+                        if timeseries.months:
+                            trend_metric = st.selectbox("추이 지표", df_structure_all.columns[1:].tolist(),
+                                                        index=df_structure_all.columns[1:].get_loc('고령비율(%)'))
+                            def build_trend():
+                                df_trend = timeseries.trend([district_code], trend_metric)[district_code]
+                                return px.line(x=df_trend.index, y=df_trend.values, markers=True,
+                                               labels={'x': '월', 'y': trend_metric},
+                                               title=f"{selected_district} {trend_metric} 월별 추이")
+                            # 수집된 월 목록이 바뀌면 다른 그림으로 취급
+                            fig_trend = figure_cache.get(('trend', district_code, trend_metric, timeseries.months), build_trend)
+                            st.plotly_chart(fig_trend, use_container_width=True)
+                            if len(timeseries.months) == 1:
+                                st.info(f"수집된 월이 {timeseries.months[0]} 하나뿐입니다. '{MONTHLY_CSV_DIR}'에 다른 월의 CSV를 추가하면 추이가 표시됩니다.")
+                        else:
+                            st.info(f"'{MONTHLY_CSV_DIR}'에서 수집된 월별 데이터가 없습니다.")
+
+                with section_tabs[7]:
+                    if section_tabs[7].open:
+                        # 10. 지역 비교
+                        profiler.mark("10. 지역 비교")
+                        st.subheader("10. 지역 비교")
+                        # 기본값: 선택한 행정구역과 같은 상위 지역의 다른 행정구역 몇 곳
+                        sibling_rows = admin_tree.children(admin_tree.parent[district_row]).tolist()
+                        default_compare = [district_row] + [row for row in sibling_rows if row != district_row][:3]
+                        # 선택 목록에는 전국 행정구역 대신 이미 고른 지역 + 같은 상위 / 하위 지역 + 검색 결과만 보냄
+                        compare_query = st.text_input("비교할 행정구역 검색", placeholder="예: 강남, ㅅㅊ, 부산 ㅎㅇ", key="compare_query")
+                        compare_hits = population.search_index.search(compare_query).tolist() if compare_query.strip() else []
+                        compare_options = list(dict.fromkeys(
+                            st.session_state.get("compare_rows", default_compare) + default_compare + compare_hits
+                            + sibling_rows + admin_tree.children(district_row).tolist()
+                        ))
+                        compare_rows = st.multiselect("비교할 행정구역", compare_options,
+                                                      default=default_compare, format_func=admin_tree.label,
+                                                      max_selections=MAX_COMPARE_DISTRICTS, key="compare_rows")
+                        compare_share = st.radio("피라미드 단위", ["비율(%)", "인구수"], horizontal=True) == "비율(%)"
+
+                        if compare_rows:
+                            # 선택한 행을 한 번의 팬시 인덱싱으로 가져와 모든 지표를 배열 연산으로 계산
+                            compare_index = np.asarray(compare_rows)
+                            compare_names = [admin_tree.label(row) for row in compare_rows]
+                            compare_values = population.values[compare_index]    # (N, 성별, 연령)
+                            compare_totals = population.totals[compare_index]    # (N, 성별)
+                            df_compare = population_structure_table(
+                                compare_values[:, 0], population.ages, index=pd.Index(compare_names, name='행정구역'),
+                                male_total=compare_totals[:, 1], female_total=compare_totals[:, 2],
+                            )
+                            compare_codes = tuple(int(code) for code in population.codes[compare_index])
+
+                            def build_compare_pyramids():
+                                binning_compare = binning_for(population.ages, bin_edges)
+                                grouped = binning_compare.aggregate(compare_values[:, 1:]).astype(float)    # (N, 남/여, 구간)
+                                if compare_share:
+                                    grouped *= 100 / np.maximum(compare_totals[:, 0], 1)[:, None, None]
+                                return compare_pyramids(compare_names, binning_compare.labels, grouped[:, 0], grouped[:, 1],
+                                                        bin_preset, share=compare_share)
+                            fig_compare_pyramid = figure_cache.get(
+                                ('compare_pyramid', compare_codes, (bin_preset, compare_share), population.version), build_compare_pyramids)
+                            st.plotly_chart(fig_compare_pyramid, use_container_width=True)
+
+                            col_compare1, col_compare2 = st.columns(2)
+                            col_compare1.plotly_chart(figure_cache.get(('compare_structure', compare_codes, None, population.version),
+                                                                       lambda: compare_structure(df_compare)), use_container_width=True)
+                            col_compare2.plotly_chart(figure_cache.get(('compare_dependency', compare_codes, None, population.version),
+                                                                       lambda: compare_dependency(df_compare)), use_container_width=True)
+                            st.dataframe(df_compare.style.format(precision=1, thousands=','), use_container_width=True)
+                        else:
+                            st.info("비교할 행정구역을 하나 이상 선택해주세요.")
+
+                with section_tabs[8]:
+                    if section_tabs[8].open:
+                        # 11. 지도
+                        profiler.mark("11. 지도")
+                        st.subheader("11. 지도")
+                        if os.path.exists(BOUNDARY_GEOJSON_PATH):
+                            # 지표 전환 버튼은 브라우저에서 색만 바꾸므로 재실행되지 않음
+                            choropleth_join, fig_choropleth = get_choropleth(
+                                population, population.version, BOUNDARY_GEOJSON_PATH,
+                                os.path.getmtime(BOUNDARY_GEOJSON_PATH), BOUNDARY_CODE_PROPERTY)
+                            if choropleth_join.locations:
+                                st.plotly_chart(fig_choropleth, use_container_width=True)
+                                st.caption(f"행정코드 속성 '{choropleth_join.code_property}'로 경계 {len(choropleth_join.locations):,}곳을 연결했습니다.")
+                            else:
+                                st.warning(f"'{BOUNDARY_GEOJSON_PATH}'의 경계를 인구 데이터의 행정코드와 연결하지 못했습니다. POPULATION_GEOJSON_CODE_PROPERTY를 확인해주세요.")
+                            if choropleth_join.unmatched:
+                                st.caption(f"인구 데이터에 없는 경계 {len(choropleth_join.unmatched):,}곳은 표시하지 않았습니다: "
+                                           f"{', '.join(map(str, choropleth_join.unmatched[:10]))}")
+                        else:
+                            st.info(f"행정경계 GeoJSON('{BOUNDARY_GEOJSON_PATH}')이 없어 지도를 표시하지 않습니다. "
+                                    "파일을 두거나 환경 변수 POPULATION_GEOJSON으로 경로를 지정해주세요.")
 
             except KeyError as e:
                 st.error(f"선택된 '{selected_district}'에 대한 데이터를 처리하는 중 오류가 발생했습니다: {e}. CSV 파일의 행정구역명과 컬럼명을 확인해주세요.")
@@ -381,3 +409,15 @@ else:
 st.sidebar.markdown("---")
 st.sidebar.markdown("본 대시보드는 Streamlit을 사용하여 제작되었습니다.")
 
+profile_entry = profiler.finish()
+if debug_mode:
+    with st.sidebar.expander("⏱ 성능 진단", expanded=True):
+        st.caption(f"이번 재실행: {profile_entry['total_ms']:,.1f} ms")
+        figure_cache_stats = get_figure_cache()
+        st.caption(f"그림 캐시: {len(figure_cache_stats)}/{figure_cache_stats.maxsize}개, 적중 {figure_cache_stats.hits}회 / 생성 {figure_cache_stats.misses}회")
+        st.dataframe(profiler.frame().style.format(precision=1), use_container_width=True)
+        profile_history = read_log(PROFILE_LOG, page="데이터활용", last=500)
+        if profile_history:
+            st.caption(f"최근 {len(profile_history)}회 재실행 백분위")
+            st.dataframe(summarize(profile_history).style.format(precision=1), use_container_width=True)
+
@@ -1,52 +1,116 @@
+import os
+
 import streamlit as st
-import yfinance as yf
 import plotly.graph_objs as go
 import pandas as pd
 
+from market_data.analytics import analyze_panel, downsample, MAX_CHART_POINTS
+from market_data.fetch import CACHE_TTL, fetch_prices, price_series, TTLCache
+from market_data.sources import make_source, PERIOD_DAYS
+from market_data.store import PriceStore
+
 top_10_tickers = [
     "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA",
     "NVDA", "META", "BRK.B", "V", "JPM"
 ]
 
-st.title("Global Top 10 Market Cap Stocks - 1 Year Price Change")
-st.write("이 앱은 글로벌 시가총액 상위 10개 기업의 최근 1년 동안의 주식 변화를 시각화합니다.")
+# 가격 데이터 소스 (환경 변수 MARKET_DATA_SOURCE=fake 로 네트워크 없이 실행 가능)
+@st.cache_resource
+def get_price_source(name):
+    return make_source(name)
+
+# 모든 세션이 공유하는 TTL 캐시 (위젯 조작/새 세션마다 다시 다운로드하지 않음)
+@st.cache_resource
+def get_price_cache():
+    return TTLCache(ttl=CACHE_TTL)
+
+# 티커별 일봉 로컬 저장소 (마지막 저장일 이후 구간만 새로 요청)
+@st.cache_resource
+def get_price_store():
+    return PriceStore()
+
+# 가격 패널의 누적 수익률 / 변동성 / 낙폭 / 상관계수 (같은 패널이면 재실행마다 다시 계산하지 않음)
+@st.cache_data(max_entries=16)
+def get_panel_analytics(df_all):
+    return analyze_panel(df_all)
+
+# 차트 종류별 (제목, y축 이름, 지표 선택 함수)
+CHART_VIEWS = {
+    "가격": ("Price", "Adjusted Close/Close Price (USD)", lambda df_all, analytics: df_all),
+    "누적 수익률": ("Cumulative Return", "Return (%)", lambda df_all, analytics: analytics.normalized),
+    "변동성": ("Rolling Volatility (21D, annualized)", "Volatility (%)", lambda df_all, analytics: analytics.volatility),
+    "낙폭": ("Drawdown from Peak", "Drawdown (%)", lambda df_all, analytics: analytics.drawdown),
+}
+
+period = st.sidebar.selectbox("기간", list(PERIOD_DAYS), index=list(PERIOD_DAYS).index("1y"))
+
+st.title(f"Global Top 10 Market Cap Stocks - {period} Price Change")
+st.write(f"이 앱은 글로벌 시가총액 상위 10개 기업의 최근 {period} 동안의 주식 변화를 시각화합니다.")
+
+source = get_price_source(os.environ.get("MARKET_DATA_SOURCE", "yahoo"))
+result = fetch_prices(top_10_tickers, source, period=period, cache=get_price_cache(), store=get_price_store())
 
 data = {}
 error_tickers = []
 
-for ticker in top_10_tickers:
-    try:
-        df = yf.download(ticker, period="1y", threads=False)
-        st.write(f"📊 {ticker} 데이터 구조: {df.columns.tolist()}")
-        if not df.empty and "Adj Close" in df.columns:
-            data[ticker] = df["Adj Close"]
-        elif not df.empty and "Close" in df.columns:
-            data[ticker] = df["Close"]
-            st.warning(f"⚠️ {ticker}에는 'Adj Close'가 없어 'Close'로 대체했습니다.")
-        else:
-            st.warning(f"⚠️ {ticker} 데이터가 없거나 'Adj Close'/'Close' 컬럼이 없습니다. (건너뜀)")
-            error_tickers.append(ticker)
-    except Exception as e:
-        st.error(f"❌ {ticker} 데이터 로드 중 오류: {e}")
-        error_tickers.append(ticker)
+for ticker, df in result.frames.items():
+    series, column = price_series(df)
+    data[ticker] = series
+    if column == "Close":
+        st.warning(f"⚠️ {ticker}에는 'Adj Close'가 없어 'Close'로 대체했습니다.")
+
+for ticker, message in result.stale.items():
+    st.warning(f"⚠️ {ticker} 최신 데이터를 가져오지 못해 저장된 데이터로 표시합니다: {message}")
+
+for ticker, message in result.errors.items():
+    st.warning(f"⚠️ {ticker} 데이터 로드 실패: {message} (건너뜀)")
+    error_tickers.append(ticker)
 
 if data:
     # Series끼리 outer join으로 통합, 결측치는 그대로 둠
     df_all = pd.concat(data.values(), axis=1, keys=data.keys()).sort_index()
+    analytics = get_panel_analytics(df_all)
+
+    view = st.radio("차트", list(CHART_VIEWS), horizontal=True)
+    title, y_title, select = CHART_VIEWS[view]
+    panel = select(df_all, analytics)
+
+    # 긴 기간은 티커별로 LTTB 다운샘플링한 뒤 WebGL(Scattergl)로 그림
     fig = go.Figure()
-    for ticker in df_all.columns:
-        fig.add_trace(go.Scatter(
-            x=df_all.index, y=df_all[ticker],
+    for ticker in panel.columns:
+        x, y = downsample(panel[ticker], MAX_CHART_POINTS)
+        fig.add_trace(go.Scattergl(
+            x=x, y=y,
             mode='lines', name=ticker
         ))
     fig.update_layout(
-        title="Top 10 Market Cap Stocks - 1 Year Price Change",
+        title=f"Top 10 Market Cap Stocks - {period} {title}",
         xaxis_title="Date",
-        yaxis_title="Adjusted Close/Close Price (USD)",
+        yaxis_title=y_title,
         template="plotly_dark"
     )
     st.plotly_chart(fig, use_container_width=True)
+
+    # 일간 로그 수익률 상관계수 (두 티커가 모두 거래한 날 기준)
+    corr_fig = go.Figure(go.Heatmap(
+        z=analytics.correlation.to_numpy(), x=list(analytics.correlation.columns), y=list(analytics.correlation.index),
+        zmin=-1, zmax=1, colorscale='RdBu', reversescale=True,
+        text=analytics.correlation.round(2).to_numpy(), texttemplate="%{text}"
+    ))
+    corr_fig.update_layout(title=f"Daily Return Correlation ({period})", template="plotly_dark",
+                           yaxis=dict(autorange='reversed'))
+    st.plotly_chart(corr_fig, use_container_width=True)
+
+    # 티커별 요약: 기간 수익률, 최근 변동성, 최대 낙폭
+    summary = pd.DataFrame({
+        "기간 수익률(%)": analytics.normalized.ffill().iloc[-1],
+        "최근 변동성(%)": analytics.volatility.ffill().iloc[-1],
+        "최대 낙폭(%)": analytics.drawdown.min(),
+    }).round(2)
+    st.dataframe(summary, use_container_width=True)
     st.success(f"성공적으로 데이터를 가져온 티커: {', '.join(data.keys())}")
+    if result.cached:
+        st.caption(f"캐시에서 불러온 티커: {', '.join(result.cached)}")
 else:
     st.error("데이터를 불러오지 못했습니다. (네트워크/야후 정책/환경 문제 가능성)")
 
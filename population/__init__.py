@@ -0,0 +1 @@
+# 연령별 인구현황 데이터 처리 모듈 (Streamlit 없이도 사용 가능)
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# 행정코드 10자리: 시도(2) + 시군구(3) + 읍면동(3) + 리(2)
+# 상위 코드는 뒷자리를 0으로 채운 코드 (일반구의 상위 시는 시군구 4자리까지 일치)
+ANCESTOR_DIGITS = (8, 5, 4, 2)
+# 4자리 일치는 일반구(예: 수원시 장안구 41111 → 수원시 41110)에만 해당하므로 이름으로 한 번 더 확인
+# (증평군 43745는 영동군 43740의 하위가 아님)
+NAME_CHECKED_DIGITS = 4
+LEVEL_NAMES = {1: '시도', 2: '시군구', 3: '읍면동'}
+
+
+def _truncate(codes, digits):
+    scale = 10 ** (10 - digits)
+    return codes // scale * scale
+
+
+# 행정코드 자릿수로 구분한 단계 (1: 시도, 2: 시군구, 3: 읍면동)
+def admin_levels(codes):
+    codes = np.asarray(codes, dtype=np.int64)
+    return np.where(codes % 10 ** 8 == 0, 1, np.where(codes % 10 ** 5 == 0, 2, 3))
+
+
+# 행정코드 계층 인덱스: 부모 배열 + CSR 형태의 자식 목록 (하위 목록 조회는 슬라이스 한 번)
+@dataclass(frozen=True)
+class AdminTree:
+    codes: np.ndarray     # 행 순서의 행정코드
+    names: np.ndarray     # 행 순서의 행정구역 이름
+    parent: np.ndarray    # 부모 행 번호 (최상위는 -1)
+    depth: np.ndarray     # 트리 깊이 (시도 = 1)
+    level: np.ndarray     # 행정코드상의 단계 (LEVEL_NAMES)
+    child_order: np.ndarray    # 부모 순으로 정렬된 행 번호 (최상위 행이 맨 앞)
+    child_offsets: np.ndarray  # 행 i의 자식은 child_order[child_offsets[i + 1]:child_offsets[i + 2]]
+    duplicated: np.ndarray  # 다른 행과 이름이 같은 행 여부
+    positions: dict       # 행정코드 -> 행 번호
+
+    # 하위 행정구역 행 번호 (parent=-1이면 최상위 시도 목록)
+    def children(self, parent=-1):
+        return self.child_order[self.child_offsets[parent + 1]:self.child_offsets[parent + 2]]
+
+    # 이름이 중복되는 행정구역(예: 세종특별자치시)은 행정코드를 붙여 표시
+    def label(self, position):
+        name = self.names[position]
+        if self.duplicated[position]:
+            return f"{name} ({self.codes[position]})"
+        return name
+
+    # 말단(자식 없는 행) 값만으로 상위 합계를 다시 계산: 깊이별로 np.add.at 한 번씩
+    def roll_up(self, values):
+        values = np.asarray(values)
+        has_children = np.diff(self.child_offsets)[1:] > 0
+        rolled = np.where(has_children.reshape((-1,) + (1,) * (values.ndim - 1)), 0, values).astype(np.int64)
+        for d in range(int(self.depth.max()), 1, -1):
+            rows = np.flatnonzero(self.depth == d)
+            np.add.at(rolled, self.parent[rows], rolled[rows])
+        return rolled
+
+    # 부모 값과 직계 자식 합이 다른 행정구역 목록 (values: 행별 값 1차원 배열, 예: 총인구수)
+    def consistency(self, values):
+        values = np.asarray(values, dtype=np.int64)
+        rows = np.flatnonzero(self.parent >= 0)
+        children_sum = np.zeros_like(values)
+        np.add.at(children_sum, self.parent[rows], values[rows])
+
+        has_children = np.diff(self.child_offsets)[1:] > 0
+        mismatch = np.flatnonzero(has_children & (children_sum != values))
+        return pd.DataFrame({
+            '행정코드': self.codes[mismatch],
+            '행정구역': self.names[mismatch],
+            '보고값': values[mismatch],
+            '하위합계': children_sum[mismatch],
+            '차이': values[mismatch] - children_sum[mismatch],
+        })
+
+
+# 행정코드 배열로 트리 구성: 뒷자리를 0으로 바꾼 상위 코드 중 실제로 존재하는 가장 가까운 코드가 부모
+def build_admin_tree(codes, names):
+    codes = np.asarray(codes, dtype=np.int64)
+    names = np.asarray(names, dtype=object)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+
+    parent = np.full(len(codes), -1, dtype=np.int64)
+    for digits in ANCESTOR_DIGITS:
+        ancestors = _truncate(codes, digits)
+        found = np.searchsorted(sorted_codes, ancestors).clip(max=len(codes) - 1)
+        exists = (sorted_codes[found] == ancestors) & (ancestors != codes) & (parent < 0)
+        if digits == NAME_CHECKED_DIGITS:
+            for i in np.flatnonzero(exists):
+                exists[i] = names[i].startswith(names[order[found[i]]] + ' ')
+        parent[exists] = order[found[exists]]
+
+    depth = np.ones(len(codes), dtype=np.int64)
+    pending = parent >= 0
+    node = parent.copy()
+    while pending.any():
+        depth[pending] += 1
+        node[pending] = parent[node[pending]]
+        pending = node >= 0
+
+    # parent + 1 기준 안정 정렬 → 같은 부모의 자식은 원래 행 순서 유지
+    child_order = np.argsort(parent + 1, kind='stable')
+    child_offsets = np.concatenate(([0], np.cumsum(np.bincount(parent + 1, minlength=len(codes) + 1))))
+
+    return AdminTree(
+        codes=codes,
+        names=names,
+        parent=parent,
+        depth=depth,
+        level=admin_levels(codes),
+        duplicated=pd.Index(names).duplicated(keep=False),
+        child_order=child_order,
+        child_offsets=child_offsets,
+        positions={int(code): i for i, code in enumerate(codes)},
+    )
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+# 연령 구간 프리셋 (각 구간의 시작 나이, 마지막 구간은 '세 이상')
+BIN_PRESETS = {
+    '세부 연령 (1세)': tuple(range(0, 101, 1)),
+    '5세 단위': tuple(range(0, 101, 5)),
+    '10세 단위': tuple(range(0, 101, 10)),
+    '유소년/생산가능/고령 (0-14/15-64/65+)': (0, 15, 65),
+}
+DEFAULT_PRESET = '10세 단위'
+
+
+# 구간 시작 나이 목록으로 라벨 생성 (예: (0, 15, 65) -> '0-14세', '15-64세', '65세 이상')
+def bin_labels(edges):
+    labels = []
+    for start, next_start in zip(edges[:-1], edges[1:]):
+        end = next_start - 1
+        labels.append(f"{start}세" if start == end else f"{start}-{end}세")
+    labels.append(f"{edges[-1]}세 이상")
+    return tuple(labels)
+
+
+# 연령 컬럼 → 구간 번호 인덱스를 한 번 계산해 두고 bincount/reduceat으로 집계
+@dataclass(frozen=True)
+class AgeBinning:
+    labels: tuple
+    index: np.ndarray  # 연령 컬럼별 구간 번호 (-1이면 집계에서 제외)
+
+    @property
+    def size(self):
+        return len(self.labels)
+
+    # 마지막 축(연령)을 구간별로 합산: 1차원(한 행정구역) 또는 (행정구역 × 연령) 행렬 모두 지원
+    def aggregate(self, values):
+        values = np.asarray(values)
+        valid = self.index >= 0
+        bin_index = self.index[valid]
+        values = values[..., valid]
+
+        if values.ndim == 1:
+            return np.bincount(bin_index, weights=values, minlength=self.size).astype(values.dtype)
+
+        counts = np.bincount(bin_index, minlength=self.size)
+        if np.all(np.diff(bin_index) >= 0) and np.all(counts > 0):
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            return np.add.reduceat(values, starts, axis=-1)
+
+        one_hot = np.zeros((len(bin_index), self.size), dtype=values.dtype)
+        one_hot[np.arange(len(bin_index)), bin_index] = 1
+        return values @ one_hot
+
+
+def _make_binning(ages, edges):
+    edges = tuple(sorted(edges))
+    index = np.searchsorted(np.asarray(edges), ages, side='right') - 1
+    index[np.asarray(ages) < 0] = -1  # 나이를 알 수 없는 라벨
+    index.setflags(write=False)
+    return AgeBinning(labels=bin_labels(edges), index=index)
+
+
+# 나이 튜플(스키마)과 구간 정의 조합마다 한 번만 인덱스를 계산해 재사용
+@lru_cache(maxsize=64)
+def binning_for(ages, edges):
+    return _make_binning(np.asarray(ages), edges)
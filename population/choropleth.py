@@ -0,0 +1,152 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import sample_colorscale
+
+from geo.cache import load_geojson_levels
+
+# 행정경계 GeoJSON 기본 위치 (환경 변수 POPULATION_GEOJSON으로 변경)
+BOUNDARY_GEOJSON = os.path.join("data", "korea_districts.geojson")
+# 행정코드가 들어 있는 속성 이름 후보 (행정동 경계: adm_cd2, 시군구: SIG_CD, 시도: CTPRVN_CD)
+CODE_PROPERTIES = ('adm_cd2', 'SIG_CD', 'CTPRVN_CD', 'sgg', 'sido', 'code')
+# 지도용 단순화 허용 오차(도)와 좌표 소수 자릿수
+BOUNDARY_RESOLUTION = (0.0005, 5)
+# 지도에서 고를 수 있는 지표 (인구 구조 표의 열 이름)
+CHOROPLETH_METRICS = ('인구수', '고령비율(%)', '성비')
+CHOROPLETH_BINS = 7
+
+
+# 행정코드 값(문자열/숫자, 2·5·8·10자리)을 인구 데이터와 같은 10자리 정수로 맞춤 (숫자가 아니면 None)
+def normalize_code(value):
+    text = str(value).strip()
+    if not text.isdigit() or len(text) > 10:
+        return None
+    return int(text.ljust(10, '0'))
+
+
+# 경계 피처와 인구 텐서 행의 연결 (시작할 때 한 번만 계산)
+@dataclass(frozen=True)
+class ChoroplethJoin:
+    locations: tuple      # 연결된 피처의 10자리 행정코드 문자열 (Plotly locations / 피처 id)
+    rows: np.ndarray      # locations 순서의 텐서 행 번호
+    features: list        # 연결된 피처 (속성은 버리고 id와 도형만 유지)
+    code_property: str
+    unmatched: tuple      # 인구 데이터에 없는 피처의 원본 코드
+
+
+def _feature_codes(features, code_property):
+    return [normalize_code(feature.get('properties', {}).get(code_property, '')) for feature in features]
+
+
+# 피처를 행정코드로 텐서 행에 연결 (code_property가 없으면 후보 속성 중 가장 많이 연결되는 것을 사용)
+def join_features(geojson, positions, code_property=None):
+    features = geojson['features']
+    candidates = (code_property,) if code_property else CODE_PROPERTIES
+    code_property, codes = max(
+        ((name, _feature_codes(features, name)) for name in candidates),
+        key=lambda item: sum(code in positions for code in item[1]),
+    )
+
+    locations, rows, joined, unmatched = [], [], [], []
+    for feature, code in zip(features, codes):
+        if code not in positions:
+            unmatched.append(feature.get('properties', {}).get(code_property))
+            continue
+        locations.append(str(code))
+        rows.append(positions[code])
+        joined.append({'type': 'Feature', 'id': str(code), 'properties': {}, 'geometry': feature['geometry']})
+    return ChoroplethJoin(
+        locations=tuple(locations),
+        rows=np.asarray(rows, dtype=np.int64),
+        features=joined,
+        code_property=code_property,
+        unmatched=tuple(unmatched),
+    )
+
+
+# 지표 값의 분위수 구간: (구간 번호 배열(결측은 NaN), 구간 경계) — 같은 경계가 겹치면 구간 수가 줄어듦
+def metric_bins(values, n_bins=CHOROPLETH_BINS):
+    values = np.asarray(values, dtype=float)
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return np.full(len(values), np.nan), np.array([0.0, 0.0])
+    edges = np.unique(np.quantile(finite, np.linspace(0, 1, n_bins + 1)))
+    if len(edges) == 1:
+        edges = np.repeat(edges, 2)
+    bins = np.searchsorted(edges[1:-1], values, side='right').astype(float)
+    bins[~np.isfinite(values)] = np.nan
+    return bins, edges
+
+
+# 구간 k개를 계단형으로 칠하는 색상표 (z = 구간 번호 0..k-1)
+def _stepped_colorscale(k):
+    colors = sample_colorscale('YlOrRd', [0.5] if k == 1 else list(np.linspace(0.1, 1, k)))
+    scale = []
+    for i, color in enumerate(colors):
+        scale += [[i / k, color], [(i + 1) / k, color]]
+    return scale
+
+
+def _format(value, metric):
+    return f"{value:,.0f}" if metric == '인구수' else f"{value:,.1f}"
+
+
+# 지표별로 미리 계산한 색 구간 / 범례 / 마우스오버 설정 (restyle 인자로 그대로 사용)
+def _metric_style(metric, column, values, n_bins):
+    bins, edges = metric_bins(values, n_bins)
+    k = len(edges) - 1
+    ticktext = [f"{_format(edges[i], metric)} ~ {_format(edges[i + 1], metric)}" for i in range(k)]
+    # restyle 인자는 브라우저에서 그대로 쓰이므로 일반 목록으로 (결측은 null)
+    return {
+        'z': [[None if np.isnan(b) else int(b) for b in bins]],
+        'zmin': -0.5,
+        'zmax': k - 0.5,
+        'colorscale': [_stepped_colorscale(k)],
+        'colorbar.title.text': metric,
+        'colorbar.tickvals': [list(range(k))],
+        'colorbar.ticktext': [ticktext],
+        'hovertemplate': f"%{{text}}<br>{metric}: %{{customdata[{column}]:{',.0f' if metric == '인구수' else ',.1f'}}}<extra></extra>",
+    }
+
+
+# 단계구분도: 도형은 한 번만 보내고 지표 전환은 브라우저에서 미리 계산한 구간 배열로 다시 칠함 (재실행 없음)
+# table: 텐서 행 순서의 인구 구조 표 (population_structure_table 결과)
+def choropleth_figure(join, table, names, metrics=CHOROPLETH_METRICS, n_bins=CHOROPLETH_BINS):
+    values = table[list(metrics)].to_numpy(dtype=float)[join.rows]
+    styles = [_metric_style(metric, i, values[:, i], n_bins) for i, metric in enumerate(metrics)]
+    first = styles[0]
+
+    fig = go.Figure(go.Choropleth(
+        geojson={'type': 'FeatureCollection', 'features': join.features},
+        locations=list(join.locations),
+        z=first['z'][0],
+        zmin=first['zmin'],
+        zmax=first['zmax'],
+        colorscale=first['colorscale'][0],
+        colorbar=dict(title=dict(text=first['colorbar.title.text']),
+                      tickvals=first['colorbar.tickvals'][0], ticktext=first['colorbar.ticktext'][0]),
+        text=[names[row] for row in join.rows],
+        customdata=values,
+        hovertemplate=first['hovertemplate'],
+        marker_line_width=0.3,
+        marker_line_color='white',
+    ))
+    fig.update_geos(fitbounds='locations', visible=False)
+    fig.update_layout(
+        height=700,
+        margin=dict(l=0, r=0, t=40, b=0),
+        updatemenus=[dict(
+            type='buttons', direction='right', x=0, y=1.05, xanchor='left', yanchor='bottom',
+            buttons=[dict(label=metric, method='restyle', args=[style]) for metric, style in zip(metrics, styles)],
+        )],
+    )
+    return fig
+
+
+# 로컬 GeoJSON을 지도용 해상도로 단순화해 읽음 (파일이 바뀌면 수정 시각이 달라 새로 단순화)
+def load_boundaries(path, resolution=BOUNDARY_RESOLUTION):
+    stat = os.stat(path)
+    name = f"{os.path.splitext(os.path.basename(path))[0]}_{stat.st_size}_{int(stat.st_mtime)}"
+    return load_geojson_levels(path, name, levels=(resolution,))[0]
@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# 인구 구조 파이 차트의 구분 이름 (AGE_BANDS 순서)
+STRUCTURE_LABELS = ('유소년인구 (0-14세)', '생산가능인구 (15-64세)', '고령인구 (65세 이상)')
+# 보관할 그림 수 (그림 하나는 수십 KB 수준)
+FIGURE_CACHE_SIZE = 256
+
+
+# 만든 그림을 키(종류, 행정구역, 구간 설정, 데이터 버전 등)별로 보관하는 크기 제한 LRU 캐시
+# 여러 세션이 같은 그림 객체를 공유하므로 꺼낸 그림은 수정하지 않고 그대로 표시만 함
+class FigureCache:
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # 키에 해당하는 그림 반환 (없으면 build()로 만들어 저장하고 가장 오래 쓰지 않은 그림부터 제거)
+    def get(self, key, build):
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return self._figures[key]
+            self.misses += 1
+        figure = build()
+        with self._lock:
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return figure
+
+    def __len__(self):
+        return len(self._figures)
+
+
+# 대시보드와 배치 리포트가 같은 모양의 그림을 쓰도록 그림 생성 함수를 한곳에 모음
+def structure_pie(district, youth_pop, working_age_pop, elderly_pop):
+    df_structure = pd.DataFrame({
+        '구분': list(STRUCTURE_LABELS),
+        '인구수': [youth_pop, working_age_pop, elderly_pop]
+    })
+    fig = px.pie(df_structure, names='구분', values='인구수',
+                 title=f'{district} 인구 구조',
+                 color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_traces(textinfo='percent+label', insidetextorientation='radial')
+    return fig
+
+
+# 연령(대)별 인구 막대 그래프 (grouped: 연령대 라벨을 인덱스로 한 Series)
+def age_distribution_bar(district, grouped, preset):
+    fig = px.bar(grouped,
+                 x=grouped.index,
+                 y=grouped.values,
+                 labels={'x': '연령대', 'y': '인구수'},
+                 title=f"{district} 연령대별 인구 분포 ({preset})")
+    fig.update_layout(xaxis_title="연령(대)", yaxis_title="인구수")
+    return fig
+
+
+# 남성은 왼쪽(음수), 여성은 오른쪽으로 그리는 인구 피라미드
+def population_pyramid(district, labels, male, female, preset):
+    labels = list(labels)
+    male_data = pd.Series(male, index=labels)
+    female_data = pd.Series(female, index=labels)
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=labels,
+        x=-male_data.values,
+        name='남성',
+        orientation='h',
+        marker=dict(color='cornflowerblue')
+    ))
+    fig.add_trace(go.Bar(
+        y=labels,
+        x=female_data.values,
+        name='여성',
+        orientation='h',
+        marker=dict(color='lightcoral')
+    ))
+
+    max_abs_pop = max(abs(male_data.min()), male_data.max(), abs(female_data.min()), female_data.max()) if labels else 1000
+
+    fig.update_layout(
+        title=f'{district} 인구 피라미드 ({preset})',
+        yaxis_title='연령(대)',
+        xaxis_title='인구수',
+        barmode='relative',
+        bargap=0.1,
+        xaxis=dict(
+            tickvals=[-max_abs_pop, 0, max_abs_pop],
+            ticktext=[f"{max_abs_pop:,.0f}", "0", f"{max_abs_pop:,.0f}"]
+        ),
+        legend_title_text='성별'
+    )
+    return fig
+
+
+# 여러 행정구역의 인구 피라미드를 겹쳐 그림 (males / females: (행정구역, 연령 구간) 배열, share=True면 각 지역 총인구 대비 %)
+def compare_pyramids(names, labels, males, females, preset, share=True):
+    labels = list(labels)
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, name in enumerate(names):
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Scatter(x=-males[i], y=labels, name=name, legendgroup=name, mode='lines+markers',
+                                 line=dict(color=color), hovertemplate=f"{name} 남성 %{{y}}: %{{customdata:,.1f}}<extra></extra>",
+                                 customdata=males[i]))
+        fig.add_trace(go.Scatter(x=females[i], y=labels, name=name, legendgroup=name, showlegend=False, mode='lines+markers',
+                                 line=dict(color=color, dash='dot'), hovertemplate=f"{name} 여성 %{{y}}: %{{x:,.1f}}<extra></extra>"))
+
+    max_abs = float(max(males.max(initial=0), females.max(initial=0))) or 1
+    unit = "%" if share else "명"
+    fig.update_layout(
+        title=f'인구 피라미드 비교 ({preset}, 왼쪽 남성 / 오른쪽 여성)',
+        yaxis_title='연령(대)',
+        xaxis_title=f'인구 비율 ({unit})' if share else '인구수',
+        xaxis=dict(
+            tickvals=[-max_abs, 0, max_abs],
+            ticktext=[f"{max_abs:,.1f}{unit}" if share else f"{max_abs:,.0f}", "0", f"{max_abs:,.1f}{unit}" if share else f"{max_abs:,.0f}"]
+        ),
+        legend_title_text='행정구역'
+    )
+    return fig
+
+
+# 행정구역별 연령대 비율 누적 막대 (table: population_structure_table 결과, 행 = 비교 지역)
+def compare_structure(table):
+    columns = ['유소년비율(%)', '생산가능비율(%)', '고령비율(%)']
+    df = table[columns].rename(columns=dict(zip(columns, STRUCTURE_LABELS)))
+    fig = px.bar(df, x=df.columns, y=df.index, orientation='h',
+                 title='연령대별 인구 비율 비교',
+                 color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_layout(barmode='stack', xaxis_title='비율 (%)', yaxis_title='행정구역', legend_title_text='구분',
+                      yaxis=dict(autorange='reversed'))
+    return fig
+
+
+# 행정구역별 부양비 / 노령화지수 묶음 막대
+def compare_dependency(table):
+    columns = ['유소년부양비', '노년부양비', '노령화지수']
+    fig = px.bar(table[columns], x=table.index, y=columns, barmode='group',
+                 title='부양비 및 노령화지수 비교')
+    fig.update_layout(xaxis_title='행정구역', yaxis_title='값', legend_title_text='지표')
+    return fig
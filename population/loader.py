@@ -0,0 +1,110 @@
+import hashlib
+import io
+import os
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+# 파싱 결과(바이너리 스냅샷)를 저장하는 위치
+SNAPSHOT_DIR = os.path.join(".cache", "population")
+# 스냅샷 구조가 바뀌면 올려서 이전 스냅샷을 무효화
+SNAPSHOT_VERSION = 2
+
+DISTRICT_COLUMN = '행정구역'
+CODE_COLUMN = '행정코드'
+
+
+# 로컬 경로 또는 URL에서 원본 바이트를 읽는 함수
+def read_source_bytes(source):
+    if os.path.exists(source):
+        with open(source, 'rb') as f:
+            return f.read()
+    with urllib.request.urlopen(source) as response:
+        return response.read()
+
+
+# 원본 바이트의 해시 (스냅샷 키로 사용)
+def source_digest(raw):
+    h = hashlib.blake2b(raw, digest_size=16)
+    h.update(str(SNAPSHOT_VERSION).encode())
+    return h.hexdigest()
+
+
+# 바이트를 한 번만 디코딩 (cp949 실패 시 파일을 다시 읽지 않고 utf-8로 디코딩)
+def decode_source(raw):
+    try:
+        return raw.decode('cp949')
+    except UnicodeDecodeError:
+        return raw.decode('utf-8-sig')
+
+
+# 행정구역 이름과 10자리 행정코드 분리 (예: "서울특별시  (1100000000)" -> "서울특별시", 1100000000)
+# 한 번의 정규식 처리로 수행하며, 코드가 없는 행은 -1
+def split_district_labels(labels):
+    labels = pd.Series(labels).astype(str)
+    parts = labels.str.extract(r"^([^(]+)\((\d+)\)")
+    names = parts[0].str.strip().fillna(labels)
+    codes = pd.to_numeric(parts[1], errors='coerce').fillna(-1).astype(np.int64)
+    return names.to_numpy(dtype=object), codes.to_numpy()
+
+
+# CSV 텍스트를 DataFrame으로 변환 (쉼표 숫자는 read_csv에서 일괄 변환)
+def parse_population_csv(text):
+    df = pd.read_csv(io.StringIO(text), thousands=',')
+
+    # 첫 번째 열 이름을 '행정구역'으로 표준화
+    if df.columns[0] != DISTRICT_COLUMN:
+        df = df.rename(columns={df.columns[0]: DISTRICT_COLUMN})
+
+    names, codes = split_district_labels(df[DISTRICT_COLUMN])
+    df.index = pd.MultiIndex.from_arrays([names, codes], names=[DISTRICT_COLUMN, CODE_COLUMN])
+    return df.drop(columns=DISTRICT_COLUMN)
+
+
+def _snapshot_path(digest, snapshot_dir):
+    return os.path.join(snapshot_dir, f"{digest}.npz")
+
+
+# 스냅샷은 모든 값 컬럼이 정수일 때만 저장 (단일 int64 배열 + 행정구역 이름/코드 + 컬럼 이름)
+def save_snapshot(df, digest, snapshot_dir=SNAPSHOT_DIR):
+    if not all(pd.api.types.is_integer_dtype(dtype) for dtype in df.dtypes):
+        return None
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = _snapshot_path(digest, snapshot_dir)
+    tmp_path = path + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        values=df.to_numpy(dtype=np.int64),
+        names=np.asarray(df.index.get_level_values(DISTRICT_COLUMN), dtype=str),
+        codes=np.asarray(df.index.get_level_values(CODE_COLUMN), dtype=np.int64),
+        columns=np.asarray(df.columns, dtype=str),
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_snapshot(digest, snapshot_dir=SNAPSHOT_DIR):
+    path = _snapshot_path(digest, snapshot_dir)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as snapshot:
+        index = pd.MultiIndex.from_arrays([snapshot['names'], snapshot['codes']], names=[DISTRICT_COLUMN, CODE_COLUMN])
+        return pd.DataFrame(snapshot['values'], index=index, columns=list(snapshot['columns']))
+
+
+# 인구 CSV를 읽어 DataFrame 반환: 같은 원본이면 스냅샷에서 바로 로드
+def read_population_table(source, snapshot_dir=SNAPSHOT_DIR):
+    raw = read_source_bytes(source)
+    digest = source_digest(raw)
+
+    df = load_snapshot(digest, snapshot_dir)
+    if df is not None:
+        return df
+
+    df = parse_population_csv(decode_source(raw))
+    try:
+        save_snapshot(df, digest, snapshot_dir)
+    except OSError:
+        pass  # 읽기 전용 환경 등에서는 캐시 없이 진행
+    return df
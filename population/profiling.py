@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+# 재실행별 구간 측정 결과를 JSON 한 줄씩 추가하는 로그 위치
+PROFILE_LOG = os.path.join(".cache", "profiling", "reruns.jsonl")
+PERCENTILES = (50, 90, 99)
+# 로그가 이 크기를 넘으면 .1 파일로 옮기고 새로 시작 (이전 .1 파일은 덮어씀)
+PROFILE_LOG_MAX_BYTES = 5 * 1024 * 1024
+# 로그 끝에서부터 읽을 때 한 번에 읽는 크기
+_TAIL_BLOCK = 64 * 1024
+
+# tracemalloc은 프로세스 전체에 걸리므로 한 번에 하나의 프로파일러만 메모리를 추적
+_tracing_lock = threading.Lock()
+_tracing_owner = None
+_log_lock = threading.Lock()
+
+
+# 재실행 한 번의 구간별 소요 시간(및 선택적으로 메모리 최대 증가량) 측정기
+# mark(name)을 부르면 이전 구간을 끝내고 새 구간을 시작 (페이지 코드를 들여쓰기로 감싸지 않아도 됨)
+class RerunProfiler:
+    def __init__(self, page, trace_memory=False):
+        global _tracing_owner
+        self.page = page
+        self.sections = []
+        self.started = time.perf_counter()
+        self._current = None
+        self._current_start = None
+        self.trace_memory = False
+        with _tracing_lock:
+            # 중간에 멈춘 재실행(st.stop 등)의 프로파일러가 사라졌으면 남은 추적 정리
+            if _tracing_owner is not None and _tracing_owner() is None:
+                _stop_tracing()
+            if trace_memory and _tracing_owner is None and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracing_owner = weakref.ref(self)
+                self.trace_memory = True
+
+    def mark(self, name):
+        self._close()
+        self._current = name
+        self._current_start = time.perf_counter()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self._current_memory = tracemalloc.get_traced_memory()[0]
+
+    def _close(self):
+        if self._current is None:
+            return
+        record = {'section': self._current, 'ms': (time.perf_counter() - self._current_start) * 1000}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record['peak_kb'] = (peak - self._current_memory) / 1024
+            record['retained_kb'] = (current - self._current_memory) / 1024
+        self.sections.append(record)
+        self._current = None
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    # 측정 종료: 마지막 구간을 닫고 로그에 한 줄 추가 (log_path=None이면 기록하지 않음)
+    def finish(self, log_path=PROFILE_LOG, **fields):
+        self._close()
+        total_ms = self.total_ms
+        if self.trace_memory:
+            with _tracing_lock:
+                _stop_tracing()
+        entry = {
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'page': self.page,
+            'total_ms': round(total_ms, 3),
+            'sections': [{k: round(v, 3) if isinstance(v, float) else v for k, v in s.items()} for s in self.sections],
+            **fields,
+        }
+        if log_path:
+            try:
+                append_log(entry, log_path)
+            except OSError:
+                pass  # 읽기 전용 환경 등에서는 기록 생략
+        return entry
+
+    # 구간별 측정 결과 표
+    def frame(self):
+        return pd.DataFrame(self.sections).set_index('section') if self.sections else pd.DataFrame()
+
+
+def _stop_tracing():
+    global _tracing_owner
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _tracing_owner = None
+
+
+def append_log(entry, log_path=PROFILE_LOG, max_bytes=PROFILE_LOG_MAX_BYTES):
+    os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+    with _log_lock:
+        if max_bytes and os.path.exists(log_path) and os.path.getsize(log_path) >= max_bytes:
+            os.replace(log_path, log_path + '.1')
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+# 파일 끝에서부터 블록 단위로 읽어 줄을 뒤에서부터 하나씩 반환 (바이트 문자열)
+def _reversed_lines(f):
+    position = f.seek(0, os.SEEK_END)
+    remainder = b''
+    while position > 0:
+        size = min(_TAIL_BLOCK, position)
+        position -= size
+        f.seek(position)
+        lines = (f.read(size) + remainder).split(b'\n')
+        remainder = lines.pop(0)
+        yield from reversed(lines)
+    yield remainder
+
+
+# 로그의 재실행 기록 목록 (깨진 줄은 건너뜀)
+# last를 주면 파일 끝에서부터 필요한 만큼만 읽어 최근 last개만 반환
+def read_log(log_path=PROFILE_LOG, page=None, last=None):
+    if not os.path.exists(log_path):
+        return []
+    entries = []
+    with open(log_path, 'rb') as f:
+        lines = _reversed_lines(f) if last is not None else f
+        for line in lines:
+            if last is not None and len(entries) >= last:
+                break
+            try:
+                entry = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if page is None or entry.get('page') == page:
+                entries.append(entry)
+    return entries[::-1] if last is not None else entries
+
+
+# 구간별(및 전체) 소요 시간 백분위 요약 (행: 구간, 열: 횟수, 평균, p50/p90/p99)
+def summarize(entries, percentiles=PERCENTILES):
+    samples = {'(전체)': [entry['total_ms'] for entry in entries]}
+    for entry in entries:
+        for section in entry['sections']:
+            samples.setdefault(section['section'], []).append(section['ms'])
+    rows = {}
+    for name, values in samples.items():
+        if not values:
+            continue
+        values = np.asarray(values, dtype=float)
+        rows[name] = {'횟수': len(values), '평균(ms)': values.mean(),
+                      **{f"p{p}(ms)": np.percentile(values, p) for p in percentiles}}
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 재실행 구간별 소요 시간 요약")
+    parser.add_argument('--log', default=PROFILE_LOG)
+    parser.add_argument('--page')
+    parser.add_argument('--last', type=int, help="최근 N회만 요약")
+    args = parser.parse_args(argv)
+    entries = read_log(args.log, args.page, last=args.last)
+    if not entries:
+        print("기록된 재실행이 없습니다.")
+        return
+    print(summarize(entries).round(2).to_string())
+
+
+if __name__ == '__main__':
+    main()
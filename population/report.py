@@ -0,0 +1,161 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from population.admin import LEVEL_NAMES
+from population.binning import BIN_PRESETS, binning_for
+from population.figures import age_distribution_bar, population_pyramid, structure_pie
+from population.loader import SNAPSHOT_DIR
+from population.structure import population_structure_table
+from population.tensor import load_tensor, open_tensor, tensor_directory
+from population.timeseries import month_key
+
+# 배치 리포트 기본값
+REPORT_DIR = "reports"
+REPORT_PRESET = '5세 단위'
+DISTRIBUTION_PRESET = '10세 단위'
+CHUNK_ROWS = 250
+
+# 작업 프로세스별로 한 번만 연 텐서 (메모리 매핑이라 프로세스 간 페이지 캐시 공유)
+_worker_tensors = {}
+
+
+# 행 번호 묶음 하나의 지표 표: 총인구/성별 인구 + 인구 구조 지표 + 남녀 연령 구간 인구(피라미드)
+def report_rows(population, rows, edges=BIN_PRESETS[REPORT_PRESET]):
+    rows = np.asarray(rows)
+    tree = population.tree
+    values = population.values[rows]
+    totals = population.totals[rows]
+
+    table = population_structure_table(values[:, 0], population.ages, male_total=totals[:, 1], female_total=totals[:, 2])
+    binning = binning_for(population.ages, edges)
+    male_grouped = binning.aggregate(values[:, 1])
+    female_grouped = binning.aggregate(values[:, 2])
+
+    parent = tree.parent[rows]
+    head = pd.DataFrame({
+        '행정코드': tree.codes[rows],
+        '행정구역': [tree.label(row) for row in rows],
+        '단계': [LEVEL_NAMES[level] for level in tree.level[rows]],
+        '상위행정코드': np.where(parent >= 0, tree.codes[parent], -1),
+        '총인구수': totals[:, 0],
+        '남자인구수': totals[:, 1],
+        '여자인구수': totals[:, 2],
+    })
+    pyramid = pd.DataFrame(
+        np.column_stack([male_grouped, female_grouped]),
+        columns=[f"남_{label}" for label in binning.labels] + [f"여_{label}" for label in binning.labels],
+    )
+    return pd.concat([head, table.reset_index(drop=True), pyramid], axis=1)
+
+
+# 행정구역 하나의 그림(인구 구조 / 연령 분포 / 인구 피라미드)을 plotly JSON으로 저장
+def write_figures(population, row, directory, edges=BIN_PRESETS[REPORT_PRESET], preset=REPORT_PRESET):
+    tree = population.tree
+    district = tree.label(row)
+    table = population_structure_table(population.values[row:row + 1, 0], population.ages)
+    youth_pop, working_age_pop, elderly_pop = table[['유소년인구', '생산가능인구', '고령인구']].to_numpy()[0]
+
+    distribution_binning = binning_for(population.ages, BIN_PRESETS[DISTRIBUTION_PRESET])
+    grouped = pd.Series(distribution_binning.aggregate(population.values[row, 0]), index=distribution_binning.labels)
+
+    pyramid_binning = binning_for(population.ages, edges)
+    male_grouped, female_grouped = pyramid_binning.aggregate(population.values[row, 1:])
+
+    figures = {
+        'structure': structure_pie(district, youth_pop, working_age_pop, elderly_pop),
+        'distribution': age_distribution_bar(district, grouped, DISTRIBUTION_PRESET),
+        'pyramid': population_pyramid(district, pyramid_binning.labels, male_grouped, female_grouped, preset),
+    }
+    path = os.path.join(directory, f"{tree.codes[row]}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{' + ','.join(f'"{name}":{fig.to_json()}' for name, fig in figures.items()) + '}')
+    return path
+
+
+def _report_chunk(population, rows, edges, preset, figures_dir):
+    if figures_dir:
+        for row in rows:
+            write_figures(population, row, figures_dir, edges, preset)
+    return report_rows(population, rows, edges)
+
+
+# 작업 프로세스: 텐서 디렉터리를 메모리 매핑으로 열어 행 묶음 처리
+def _report_chunk_in_worker(directory, rows, edges, preset, figures_dir):
+    if directory not in _worker_tensors:
+        _worker_tensors[directory] = open_tensor(directory)
+    return _report_chunk(_worker_tensors[directory], rows, edges, preset, figures_dir)
+
+
+# 전체 행정구역 리포트: 행을 chunk_rows개씩 나눠 프로세스 풀에서 계산 (workers=1이면 현재 프로세스에서 계산)
+def build_report(population, directory=None, preset=REPORT_PRESET, figures_dir=None, workers=None, chunk_rows=CHUNK_ROWS):
+    edges = BIN_PRESETS[preset]
+    chunks = [np.arange(start, min(start + chunk_rows, len(population.codes)))
+              for start in range(0, len(population.codes), chunk_rows)]
+    if figures_dir:
+        os.makedirs(figures_dir, exist_ok=True)
+
+    if workers == 1 or directory is None or not os.path.exists(directory):
+        parts = [_report_chunk(population, rows, edges, preset, figures_dir) for rows in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(
+                _report_chunk_in_worker,
+                [directory] * len(chunks), chunks, [edges] * len(chunks), [preset] * len(chunks),
+                [figures_dir] * len(chunks),
+            ))
+    return pd.concat(parts, ignore_index=True)
+
+
+# 리포트 표를 CSV(엑셀 호환 utf-8-sig) / Parquet으로 저장하고 저장한 경로 목록 반환
+def write_report(report, output_dir, month, formats=('csv',)):
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.join(output_dir, f"population_report_{month_key(month)}")
+    paths = []
+    if 'csv' in formats:
+        report.to_csv(stem + '.csv', index=False, encoding='utf-8-sig')
+        paths.append(stem + '.csv')
+    if 'parquet' in formats:
+        report.to_parquet(stem + '.parquet', index=False)
+        paths.append(stem + '.parquet')
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전체 행정구역 인구 리포트 일괄 생성")
+    parser.add_argument('total_source', help="남녀 합계 CSV 경로 또는 URL")
+    parser.add_argument('gender_source', help="남녀 구분 CSV 경로 또는 URL")
+    parser.add_argument('--output-dir', default=REPORT_DIR)
+    parser.add_argument('--format', choices=['csv', 'parquet', 'both'], default='csv')
+    parser.add_argument('--bins', choices=list(BIN_PRESETS), default=REPORT_PRESET, help="인구 피라미드 연령 구간")
+    parser.add_argument('--figures', action='store_true', help="행정구역별 그림 JSON도 저장")
+    parser.add_argument('--workers', type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--snapshot-dir', default=SNAPSHOT_DIR)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    population = load_tensor(args.total_source, args.gender_source, args.snapshot_dir)
+    figures_dir = os.path.join(args.output_dir, 'figures', month_key(population.month)) if args.figures else None
+    report = build_report(
+        population,
+        directory=tensor_directory(population.version, args.snapshot_dir),
+        preset=args.bins,
+        figures_dir=figures_dir,
+        workers=args.workers,
+        chunk_rows=args.chunk_rows,
+    )
+    formats = ('csv', 'parquet') if args.format == 'both' else (args.format,)
+    for path in write_report(report, args.output_dir, population.month, formats):
+        print(f"저장: {path}")
+    if figures_dir:
+        print(f"그림 JSON: {figures_dir} ({len(report):,}개 행정구역)")
+    print(f"행정구역 {len(report):,}곳, {time.perf_counter() - start:.1f}초")
+
+
+if __name__ == '__main__':
+    main()
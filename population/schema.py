@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# 컬럼 이름 형식: '2025년04월_계_총인구수', '2025년04월_남_15세', '2025년04월_여_100세 이상'
+COLUMN_PATTERN = (
+    r"^(?P<월>\d{4}년\d{2}월)_(?P<성별>계|남|여)_"
+    r"(?:(?P<항목>총인구수|연령구간인구수)|(?P<연령>\d+)세(?P<이상> 이상)?)$"
+)
+AGE_MEASURE = '연령'
+
+
+# 컬럼 헤더를 (월, 성별, 항목, 연령) 구조로 한 번 파싱해 둔 조회 테이블
+@dataclass(frozen=True)
+class ColumnSchema:
+    months: tuple
+    sexes: tuple
+    measures: dict       # (월, 성별, 항목) -> 컬럼 이름
+    age_columns: dict    # (월, 성별) -> 나이 순으로 정렬된 컬럼 이름 튜플
+    age_positions: dict  # (월, 성별) -> 나이 순으로 정렬된 컬럼 위치 배열
+    ages: dict           # (월, 성별) -> 나이 튜플 ('100세 이상'은 100)
+    age_labels: dict     # (월, 성별) -> 연령 라벨 튜플 ('0세', ..., '100세 이상')
+
+    @property
+    def latest_month(self):
+        return self.months[-1] if self.months else None
+
+    def column(self, measure, sex, month=None):
+        return self.measures.get((month or self.latest_month, sex, measure))
+
+    def age_columns_of(self, sex, month=None):
+        return self.age_columns.get((month or self.latest_month, sex), ())
+
+    def age_positions_of(self, sex, month=None):
+        return self.age_positions.get((month or self.latest_month, sex), np.array([], dtype=np.int64))
+
+    def ages_of(self, sex, month=None):
+        return self.ages.get((month or self.latest_month, sex), ())
+
+    def age_labels_of(self, sex, month=None):
+        return self.age_labels.get((month or self.latest_month, sex), ())
+
+
+# 컬럼 목록을 한 번의 정규식 처리로 파싱
+def parse_columns(columns):
+    columns = pd.Index(columns)
+    parsed = pd.Series(columns.astype(str)).str.extract(COLUMN_PATTERN)
+    age = pd.to_numeric(parsed['연령'], errors='coerce')
+    parsed['항목'] = parsed['항목'].where(age.isna(), AGE_MEASURE)
+    parsed['연령'] = age.astype('Int64')
+    parsed['위치'] = np.arange(len(columns))
+    parsed['컬럼'] = columns
+    parsed['라벨'] = parsed['연령'].astype(str) + '세' + parsed['이상'].fillna('')
+
+    known = parsed.dropna(subset=['월', '성별', '항목'])
+    measures = {
+        (row.월, row.성별, row.항목): row.컬럼
+        for row in known[known['항목'] != AGE_MEASURE].itertuples()
+    }
+
+    age_columns, age_positions, ages, age_labels = {}, {}, {}, {}
+    age_rows = known[known['항목'] == AGE_MEASURE].sort_values(['월', '성별', '연령'], kind='stable')
+    for key, group in age_rows.groupby(['월', '성별'], sort=False):
+        age_columns[key] = tuple(group['컬럼'])
+        age_positions[key] = group['위치'].to_numpy()
+        ages[key] = tuple(int(a) for a in group['연령'])
+        age_labels[key] = tuple(group['라벨'])
+
+    return ColumnSchema(
+        months=tuple(sorted(known['월'].unique())),
+        sexes=tuple(known['성별'].unique()),
+        measures=measures,
+        age_columns=age_columns,
+        age_positions=age_positions,
+        ages=ages,
+        age_labels=age_labels,
+    )
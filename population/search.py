@@ -0,0 +1,110 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+
+import numpy as np
+
+# 한글 음절의 초성 (유니코드 음절 순서) — 호환용 자모로 표기
+CHOSEONG = ('ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+_SYLLABLE_FIRST, _SYLLABLE_LAST = 0xAC00, 0xD7A3
+_SYLLABLES_PER_CHOSEONG = 21 * 28
+_JAMO = frozenset(chr(code) for code in range(0x3131, 0x3164))
+SEARCH_LIMIT = 20
+
+
+# 문자열의 한글 음절을 초성으로 바꿈 (예: '서울특별시' -> 'ㅅㅇㅌㅂㅅ', 한글이 아닌 문자는 그대로)
+def choseong(text):
+    return ''.join(
+        CHOSEONG[(ord(ch) - _SYLLABLE_FIRST) // _SYLLABLES_PER_CHOSEONG] if _SYLLABLE_FIRST <= ord(ch) <= _SYLLABLE_LAST else ch
+        for ch in text
+    )
+
+
+# 정렬된 키 배열 + 키 순서로 이어 붙인 행 번호(CSR): 접두어가 같은 키는 연속 구간이므로
+# 접두어 검색 결과는 이분 탐색 두 번과 슬라이스 한 번으로 구함 (트라이의 한 노드 아래 전체와 같은 범위)
+@dataclass(frozen=True)
+class PrefixIndex:
+    keys: list
+    offsets: np.ndarray   # 키 i의 행 번호는 rows[offsets[i]:offsets[i + 1]]
+    rows: np.ndarray
+
+    def match(self, prefix):
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + '\uffff', lo)
+        return self.rows[self.offsets[lo]:self.offsets[hi]]
+
+
+def _prefix_index(pairs):
+    pairs = sorted(set(pairs))
+    keys = []
+    counts = []
+    for key, _ in pairs:
+        if keys and keys[-1] == key:
+            counts[-1] += 1
+        else:
+            keys.append(key)
+            counts.append(1)
+    return PrefixIndex(
+        keys=keys,
+        offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+        rows=np.array([row for _, row in pairs], dtype=np.int64),
+    )
+
+
+# 단어가 검색어로 시작하는지: 검색어의 자모 위치는 초성으로, 완성된 음절 위치는 음절 그대로 비교
+def _matches_mixed(word, token):
+    return len(word) >= len(token) and all(
+        choseong(w) == t if t in _JAMO else w == t for w, t in zip(word, token)
+    )
+
+
+# 행정구역 이름 검색 인덱스: 이름의 각 단어(예: '서울특별시', '종로구')를 음절 그대로 / 초성으로 각각 색인
+@dataclass(frozen=True)
+class SearchIndex:
+    syllables: PrefixIndex
+    initials: PrefixIndex
+    order: np.ndarray     # 행 번호별 정렬 순위 (작을수록 먼저 표시)
+    words: tuple          # 행 번호별 이름 단어 목록 (음절과 자모가 섞인 검색어 확인용)
+
+    # 검색어의 단어마다 접두어가 일치하는 단어를 가진 행의 교집합을 순위 순으로 최대 limit개 반환
+    # 자모가 들어간 단어(예: 'ㅅㅇ', '종ㄹ')는 초성으로 후보를 찾고, 입력한 음절(예: '종')은 그대로 일치하는 행만 남김
+    def search(self, query, limit=SEARCH_LIMIT):
+        matched = None
+        for token in query.split():
+            if any(ch in _JAMO for ch in token):
+                rows = self.initials.match(choseong(token))
+                if not all(ch in _JAMO for ch in token):
+                    rows = np.array([row for row in np.unique(rows)
+                                     if any(_matches_mixed(word, token) for word in self.words[row])], dtype=np.int64)
+            else:
+                rows = self.syllables.match(token)
+            # 한 행의 여러 단어가 같은 접두어와 일치하면 행 번호가 중복되므로 먼저 중복 제거
+            rows = np.unique(rows)
+            matched = rows if matched is None else np.intersect1d(matched, rows, assume_unique=True)
+            if len(matched) == 0:
+                break
+        if matched is None or len(matched) == 0:
+            return np.empty(0, dtype=np.int64)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(self.order[matched], limit - 1)[:limit]]
+        return matched[np.argsort(self.order[matched], kind='stable')]
+
+
+# names: 행 순서의 행정구역 이름, depth: 트리 깊이(상위 행정구역 먼저), weights: 같은 깊이에서 큰 값 먼저 (예: 총인구수)
+def build_search_index(names, depth=None, weights=None):
+    syllable_pairs = []
+    initial_pairs = []
+    words = []
+    for row, name in enumerate(names):
+        row_words = tuple(set(str(name).split()))
+        words.append(row_words)
+        for word in row_words:
+            syllable_pairs.append((word, row))
+            initial_pairs.append((choseong(word), row))
+
+    n = len(names)
+    depth = np.zeros(n) if depth is None else np.asarray(depth)
+    weights = np.zeros(n) if weights is None else np.asarray(weights)
+    order = np.empty(n, dtype=np.int64)
+    order[np.lexsort((-weights, depth))] = np.arange(n)
+    return SearchIndex(syllables=_prefix_index(syllable_pairs), initials=_prefix_index(initial_pairs), order=order,
+                       words=tuple(words))
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# 인구 구조 분석용 연령대 구분 (이름, 시작 나이, 끝 나이 / None이면 이상)
+AGE_BANDS = (
+    ('유소년인구', 0, 14),
+    ('생산가능인구', 15, 64),
+    ('고령인구', 65, None),
+)
+
+
+# 연령 × 연령대 0/1 마스크 행렬 (나이를 알 수 없는 행은 모두 0이라 집계에서 제외됨)
+def age_band_mask(ages, bands=AGE_BANDS):
+    ages = np.asarray(ages)
+    mask = np.zeros((len(ages), len(bands)), dtype=np.int64)
+    for j, (_, start, end) in enumerate(bands):
+        upper = ages <= end if end is not None else True
+        mask[:, j] = (ages >= start) & upper
+    return mask
+
+
+# 연령대별 인구수: (행정구역 × 연령) 행렬과 마스크의 행렬곱 한 번으로 계산
+def band_totals(age_matrix, ages, bands=AGE_BANDS):
+    return np.asarray(age_matrix) @ age_band_mask(ages, bands)
+
+
+# 전국 행정구역의 인구 구조 지표 표 (인구수, 비율, 부양비, 노령화지수, 성비)
+def population_structure_table(age_matrix, ages, index=None, male_total=None, female_total=None):
+    counts = band_totals(age_matrix, ages)
+    youth, working, elderly = counts[:, 0], counts[:, 1], counts[:, 2]
+    total = counts.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table = pd.DataFrame({
+            '유소년인구': youth,
+            '생산가능인구': working,
+            '고령인구': elderly,
+            '인구수': total,
+            '유소년비율(%)': youth / total * 100,
+            '생산가능비율(%)': working / total * 100,
+            '고령비율(%)': elderly / total * 100,
+            '유소년부양비': youth / working * 100,
+            '노년부양비': elderly / working * 100,
+            '총부양비': (youth + elderly) / working * 100,
+            '노령화지수': elderly / youth * 100,
+        }, index=index)
+        if male_total is not None and female_total is not None:
+            table['성비'] = np.asarray(male_total) / np.asarray(female_total) * 100
+
+    # 0으로 나눈 결과(inf)는 결측으로 표시
+    return table.replace([np.inf, -np.inf], np.nan)
@@ -0,0 +1,148 @@
+import json
+import os
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from population.admin import build_admin_tree
+from population.loader import CODE_COLUMN, DISTRICT_COLUMN, SNAPSHOT_DIR, read_population_table, read_source_bytes, source_digest
+from population.schema import parse_columns
+from population.search import build_search_index
+
+# 텐서의 성별 축 순서
+SEXES = ('계', '남', '여')
+
+
+# 행정구역 × 성별(계/남/여) × 연령 int32 텐서 (프로세스당 하나, 읽기 전용 뷰로 공유)
+@dataclass(frozen=True)
+class PopulationTensor:
+    values: np.ndarray     # (행정구역, 성별, 연령) 연령별 인구수
+    totals: np.ndarray     # (행정구역, 성별) 총인구수
+    districts: pd.CategoricalIndex
+    codes: np.ndarray      # 행 순서의 10자리 행정코드
+    ages: tuple
+    age_labels: tuple
+    month: str
+    version: str           # 원본 파일 해시 (데이터 버전)
+
+    # 행정코드 계층 인덱스 (프로세스당 한 번 구성)
+    @cached_property
+    def tree(self):
+        return build_admin_tree(self.codes, np.asarray(self.districts))
+
+    # 행정구역 이름 검색 인덱스 (상위 행정구역, 인구가 많은 곳 순)
+    @cached_property
+    def search_index(self):
+        return build_search_index(np.asarray(self.districts), self.tree.depth, self.totals[:, 0])
+
+    def sex_index(self, sex):
+        return SEXES.index(sex)
+
+    # 데이터 보기용 표: 성별 × (총인구수 + 연령별 인구수)
+    def frame(self, position, sexes=SEXES):
+        rows = [self.sex_index(sex) for sex in sexes]
+        data = np.column_stack([self.totals[position, rows], self.values[position, rows]])
+        columns = [f"{self.month}_총인구수"] + [f"{self.month}_{label}" for label in self.age_labels]
+        return pd.DataFrame(data, index=pd.Index(sexes, name='성별'), columns=columns)
+
+
+def _read_only(array):
+    view = array.view()
+    view.setflags(write=False)
+    return view
+
+
+# 남녀 합계 / 남녀 구분 테이블을 하나의 텐서로 통합
+def build_tensor(df_total, df_gender, version=''):
+    if not df_total.index.equals(df_gender.index):
+        raise ValueError("남녀 합계 데이터와 남녀 구분 데이터의 행정구역 목록이 일치하지 않습니다.")
+
+    schema_total = parse_columns(df_total.columns)
+    schema_gender = parse_columns(df_gender.columns)
+    ages = schema_total.ages_of('계')
+    if schema_gender.ages_of('남') != ages or schema_gender.ages_of('여') != ages:
+        raise ValueError("남녀 합계 데이터와 남녀 구분 데이터의 연령 구성이 일치하지 않습니다.")
+
+    total_values = df_total.to_numpy()
+    gender_values = df_gender.to_numpy()
+    values = np.empty((len(df_total), len(SEXES), len(ages)), dtype=np.int32)
+    values[:, 0] = total_values[:, schema_total.age_positions_of('계')]
+    values[:, 1] = gender_values[:, schema_gender.age_positions_of('남')]
+    values[:, 2] = gender_values[:, schema_gender.age_positions_of('여')]
+
+    totals = np.empty((len(df_total), len(SEXES)), dtype=np.int32)
+    totals[:, 0] = df_total[schema_total.column('총인구수', '계')].to_numpy()
+    totals[:, 1] = df_gender[schema_gender.column('총인구수', '남')].to_numpy()
+    totals[:, 2] = df_gender[schema_gender.column('총인구수', '여')].to_numpy()
+
+    return PopulationTensor(
+        values=_read_only(values),
+        totals=_read_only(totals),
+        districts=pd.CategoricalIndex(df_total.index.get_level_values(DISTRICT_COLUMN), name=DISTRICT_COLUMN),
+        codes=_read_only(df_total.index.get_level_values(CODE_COLUMN).to_numpy(dtype=np.int64)),
+        ages=ages,
+        age_labels=schema_total.age_labels_of('계'),
+        month=schema_total.latest_month,
+        version=version,
+    )
+
+
+# 텐서를 .npy 파일로 저장 (다음 실행부터 메모리 매핑으로 로드)
+def save_tensor(tensor, directory):
+    tmp_dir = directory + ".tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    np.save(os.path.join(tmp_dir, 'values.npy'), tensor.values)
+    np.save(os.path.join(tmp_dir, 'totals.npy'), tensor.totals)
+    np.save(os.path.join(tmp_dir, 'districts.npy'), np.asarray(tensor.districts, dtype=str))
+    np.save(os.path.join(tmp_dir, 'codes.npy'), tensor.codes)
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'ages': list(tensor.ages),
+            'age_labels': list(tensor.age_labels),
+            'month': tensor.month,
+            'version': tensor.version,
+        }, f, ensure_ascii=False)
+    os.replace(tmp_dir, directory)
+
+
+# 저장된 텐서를 읽기 전용 메모리 매핑으로 로드 (페이지 캐시를 프로세스 간에도 공유)
+def open_tensor(directory):
+    with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    names = np.load(os.path.join(directory, 'districts.npy'))
+    return PopulationTensor(
+        values=np.load(os.path.join(directory, 'values.npy'), mmap_mode='r'),
+        totals=np.load(os.path.join(directory, 'totals.npy'), mmap_mode='r'),
+        districts=pd.CategoricalIndex(names, name=DISTRICT_COLUMN),
+        codes=np.load(os.path.join(directory, 'codes.npy'), mmap_mode='r'),
+        ages=tuple(meta['ages']),
+        age_labels=tuple(meta['age_labels']),
+        month=meta['month'],
+        version=meta['version'],
+    )
+
+
+# 데이터 버전별 텐서 저장 위치 (다른 프로세스도 이 경로로 같은 텐서를 메모리 매핑)
+def tensor_directory(version, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"tensor-{version}")
+
+
+# 두 원본 CSV로부터 텐서 로드: 원본 해시가 같으면 CSV를 파싱하지 않고 메모리 매핑
+def load_tensor(total_source, gender_source, snapshot_dir=SNAPSHOT_DIR):
+    version = source_digest(read_source_bytes(total_source) + read_source_bytes(gender_source))
+    directory = tensor_directory(version, snapshot_dir)
+    if os.path.exists(os.path.join(directory, 'meta.json')):
+        return open_tensor(directory)
+
+    tensor = build_tensor(
+        read_population_table(total_source, snapshot_dir),
+        read_population_table(gender_source, snapshot_dir),
+        version=version,
+    )
+    try:
+        save_tensor(tensor, directory)
+    except OSError:
+        return tensor  # 읽기 전용 환경 등에서는 메모리 텐서를 그대로 사용
+    return open_tensor(directory)
@@ -0,0 +1,255 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from population.loader import split_district_labels
+from population.schema import parse_columns
+from population.structure import population_structure_table
+from population.tensor import SEXES
+
+# 월별 파티션 저장소 위치와 수집 대상 파일 패턴
+STORE_DIR = os.path.join(".cache", "timeseries")
+CSV_PATTERN = "*연령별인구현황*.csv"
+CHUNK_ROWS = 2000
+
+MANIFEST_FILE = 'manifest.json'
+STAGING_DIR = '_staging'
+
+
+# '2025년04월' -> '2025-04' (파티션 디렉터리 이름)
+def month_key(month):
+    return f"{month[:4]}-{month[5:7]}"
+
+
+# 헤더만 읽어 컬럼과 인코딩 확인 (cp949 실패 시 utf-8)
+def read_header(path):
+    for encoding in ('cp949', 'utf-8-sig'):
+        try:
+            return pd.read_csv(path, nrows=0, encoding=encoding).columns, encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"인코딩을 확인할 수 없는 파일입니다: {path}")
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# 월별 파티션 저장소: month=YYYY-MM/ 아래 values/totals/codes/names .npy (읽을 때는 메모리 매핑)
+@dataclass(frozen=True)
+class TimeSeriesStore:
+    directory: str
+    months: tuple       # '2025년04월' 형식, 오래된 순
+    ages: tuple
+    age_labels: tuple
+
+    def partition_dir(self, month):
+        return os.path.join(self.directory, f"month={month_key(month)}")
+
+    def load(self, month, name):
+        return np.load(os.path.join(self.partition_dir(month), f"{name}.npy"), mmap_mode='r')
+
+    # 행정코드 목록의 해당 월 행 번호 (없는 코드는 -1)
+    def rows(self, month, codes):
+        month_codes = np.asarray(self.load(month, 'codes'))
+        order = np.argsort(month_codes, kind='stable')
+        found = np.searchsorted(month_codes[order], codes).clip(max=len(month_codes) - 1)
+        rows = order[found]
+        return np.where(month_codes[rows] == codes, rows, -1)
+
+    # 행정구역별 지표의 월별 추이 (행: 월, 열: 행정코드); 필요한 행과 '계' 연령 축만 읽음
+    def trend(self, codes, metric='고령비율(%)'):
+        codes = np.asarray(codes, dtype=np.int64)
+        result = pd.DataFrame(np.nan, index=pd.Index(self.months, name='월'), columns=codes)
+        for month in self.months:
+            rows = self.rows(month, codes)
+            present = rows >= 0
+            if not present.any():
+                continue
+            values = self.load(month, 'values')[rows[present], 0]
+            totals = self.load(month, 'totals')[rows[present]]
+            table = population_structure_table(values, self.ages, male_total=totals[:, 1], female_total=totals[:, 2])
+            result.loc[month, codes[present]] = table[metric].to_numpy()
+        return result
+
+
+def open_store(store_dir=STORE_DIR):
+    manifest = _read_json(os.path.join(store_dir, MANIFEST_FILE), {})
+    return TimeSeriesStore(
+        directory=store_dir,
+        months=tuple(manifest.get('months', [])),
+        ages=tuple(manifest.get('ages', [])),
+        age_labels=tuple(manifest.get('age_labels', [])),
+    )
+
+
+# 파일 하나를 청크 단위로 읽어 아직 없는 (월, 성별) 데이터만 스테이징 파일에 이어 씀
+def _stage_file(path, wanted, staging_dir, chunksize):
+    columns, encoding = read_header(path)
+    schema = parse_columns(columns)
+    blocks = [
+        (month, sex, schema.column('총인구수', sex, month), list(schema.age_columns_of(sex, month)))
+        for month, sex in wanted
+    ]
+    usecols = [columns[0]] + [col for _, _, total_col, age_cols in blocks for col in [total_col] + age_cols]
+
+    reader = pd.read_csv(path, encoding=encoding, thousands=',', usecols=usecols, chunksize=chunksize)
+    for chunk in reader:
+        names, codes = split_district_labels(chunk[columns[0]])
+        for month, sex, total_col, age_cols in blocks:
+            prefix = os.path.join(staging_dir, f"{month_key(month)}_{sex}")
+            with open(prefix + ".codes.bin", 'ab') as f:
+                codes.astype(np.int64).tofile(f)
+            with open(prefix + ".totals.bin", 'ab') as f:
+                chunk[total_col].to_numpy(dtype=np.int32).tofile(f)
+            with open(prefix + ".values.bin", 'ab') as f:
+                chunk[age_cols].to_numpy(dtype=np.int32).tofile(f)
+            with open(prefix + ".names.txt", 'a', encoding='utf-8') as f:
+                f.writelines(f"{name}\n" for name in names)
+
+
+def _read_staged(staging_dir, month, sex, n_ages):
+    prefix = os.path.join(staging_dir, f"{month_key(month)}_{sex}")
+    codes = np.fromfile(prefix + ".codes.bin", dtype=np.int64)
+    totals = np.fromfile(prefix + ".totals.bin", dtype=np.int32)
+    values = np.fromfile(prefix + ".values.bin", dtype=np.int32).reshape(len(codes), n_ages)
+    with open(prefix + ".names.txt", encoding='utf-8') as f:
+        names = np.array(f.read().splitlines(), dtype=str)
+    return codes, names, totals, values
+
+
+# 스테이징된 (월, 성별) 데이터를 행정코드 기준으로 맞춰 월 파티션 하나로 저장
+def _write_partition(store, month, staged_sexes, staging_dir):
+    n_ages = len(store.ages)
+    parts = {sex: _read_staged(staging_dir, month, sex, n_ages) for sex in staged_sexes}
+    reference = parts['계'] if '계' in parts else parts['남']
+    codes, names = reference[0], reference[1]
+
+    values = np.zeros((len(codes), len(SEXES), n_ages), dtype=np.int32)
+    totals = np.zeros((len(codes), len(SEXES)), dtype=np.int32)
+    for sex, (sex_codes, _, sex_totals, sex_values) in parts.items():
+        i = SEXES.index(sex)
+        if np.array_equal(sex_codes, codes):
+            rows = np.arange(len(codes))
+        else:
+            order = np.argsort(sex_codes, kind='stable')
+            found = np.searchsorted(sex_codes[order], codes).clip(max=len(sex_codes) - 1)
+            rows = np.where(sex_codes[order[found]] == codes, order[found], -1)
+        present = rows >= 0
+        values[present, i] = sex_values[rows[present]]
+        totals[present, i] = sex_totals[rows[present]]
+    if '계' not in parts:
+        values[:, 0] = values[:, 1] + values[:, 2]
+        totals[:, 0] = totals[:, 1] + totals[:, 2]
+
+    directory = store.partition_dir(month)
+    tmp_dir = directory + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, 'values.npy'), values)
+    np.save(os.path.join(tmp_dir, 'totals.npy'), totals)
+    np.save(os.path.join(tmp_dir, 'codes.npy'), codes)
+    np.save(os.path.join(tmp_dir, 'names.npy'), names)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+
+
+# 디렉터리의 월별 CSV 중 저장소에 없는 월만 수집 (이미 있는 월은 헤더만 읽고 건너뜀)
+def ingest_directory(source_dir, store_dir=STORE_DIR, pattern=CSV_PATTERN, chunksize=CHUNK_ROWS):
+    store = open_store(store_dir)
+    staging_dir = os.path.join(store_dir, STAGING_DIR)
+    os.makedirs(staging_dir, exist_ok=True)
+
+    staged_path = os.path.join(staging_dir, 'staged.json')
+    staged = {tuple(key) for key in _read_json(staged_path, [])}
+    # 이전 실행이 중간에 멈춰 남은 스테이징 파일 정리
+    staged_prefixes = {f"{month_key(month)}_{sex}" for month, sex in staged}
+    for name in os.listdir(staging_dir):
+        if name != 'staged.json' and name.split('.')[0] not in staged_prefixes:
+            os.remove(os.path.join(staging_dir, name))
+
+    ages, age_labels = store.ages, store.age_labels
+    for path in sorted(glob.glob(os.path.join(source_dir, pattern))):
+        columns, _ = read_header(path)
+        schema = parse_columns(columns)
+        wanted = [
+            (month, sex) for month in schema.months for sex in schema.sexes
+            if month not in store.months and (month, sex) not in staged and schema.age_columns_of(sex, month)
+        ]
+        if not wanted:
+            continue
+        file_ages = schema.ages_of(wanted[0][1], wanted[0][0])
+        if ages and tuple(ages) != file_ages:
+            raise ValueError(f"연령 구성이 저장소와 다른 파일입니다: {path}")
+        ages, age_labels = file_ages, schema.age_labels_of(wanted[0][1], wanted[0][0])
+
+        _stage_file(path, wanted, staging_dir, chunksize)
+        staged.update(wanted)
+        _write_json(staged_path, sorted(staged))
+
+    store = TimeSeriesStore(directory=store_dir, months=store.months, ages=tuple(ages), age_labels=tuple(age_labels))
+    months = set(store.months)
+    written = []
+    for month in sorted({month for month, _ in staged}):
+        staged_sexes = [sex for sex in SEXES if (month, sex) in staged]
+        # 남녀 구분 데이터가 모두 있어야 파티션 생성 (합계만 있으면 다음 수집까지 대기)
+        if '남' not in staged_sexes or '여' not in staged_sexes:
+            continue
+        _write_partition(store, month, staged_sexes, staging_dir)
+        months.add(month)
+        written.append(month)
+        _write_json(os.path.join(store_dir, MANIFEST_FILE), {
+            'months': sorted(months),
+            'ages': list(store.ages),
+            'age_labels': list(store.age_labels),
+        })
+        for sex in staged_sexes:
+            staged.discard((month, sex))
+            for suffix in ('codes.bin', 'totals.bin', 'values.bin', 'names.txt'):
+                os.remove(os.path.join(staging_dir, f"{month_key(month)}_{sex}.{suffix}"))
+        _write_json(staged_path, sorted(staged))
+
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="월별 연령별 인구현황 CSV 시계열 저장소")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help="디렉터리의 CSV 중 새 월만 저장소에 추가")
+    ingest_parser.add_argument('source_dir')
+    ingest_parser.add_argument('--store', default=STORE_DIR)
+    ingest_parser.add_argument('--pattern', default=CSV_PATTERN)
+    ingest_parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS)
+
+    trend_parser = subparsers.add_parser('trend', help="행정코드별 지표의 월별 추이 출력")
+    trend_parser.add_argument('codes', nargs='+', type=int)
+    trend_parser.add_argument('--store', default=STORE_DIR)
+    trend_parser.add_argument('--metric', default='고령비율(%)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'ingest':
+        written = ingest_directory(args.source_dir, args.store, args.pattern, args.chunksize)
+        print(f"새로 저장한 월: {', '.join(written) if written else '없음'}")
+    else:
+        print(open_store(args.store).trend(args.codes, args.metric).to_string())
+
+
+if __name__ == '__main__':
+    main()